@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from networkx import (Graph, closeness_centrality, has_path, shortest_path,
-                      shortest_path_length)
+import numpy as np
+from networkx import Graph, connected_components
 
 from .player import Player
+from .shortest_paths import (TABLE_MAX_NODES, adjacency_matrix, bidirectional_search, closeness_ranking,
+                             csr_adjacency, estimated_closeness_ranking, is_path_alive, reachable_nodes,
+                             shortest_path_tables)
 
 
 class Cops(Player):
@@ -15,6 +18,13 @@ class Cops(Player):
                  max_rounds: int | None = None) -> None:
         """Initializes the cops.
 
+        The pairwise distances and first hops are only tabulated for graphs of
+        up to 'TABLE_MAX_NODES' nodes, which also keeps every distance below
+        the int16 sentinel 'UNREACHABLE'. On larger graphs, the tables would
+        take hundreds of megabytes, so every path is searched when it is
+        needed instead and the centrality of the nodes is estimated from
+        searches from 'TABLE_MAX_NODES' pivot nodes.
+
         :param graph: The Graph the game should be played on.
         :param cops_count: The number of cops in the game. Defaults to None,
         which means that Cops can choose their own number.
@@ -30,7 +40,20 @@ class Cops(Player):
         """
         super().__init__(graph, cops_count, timeout_init, timeout_step, max_rounds)
 
-        self.centrality = closeness_centrality(graph)
+        if len(graph) <= TABLE_MAX_NODES:
+            self.nodes, self.node_indices, self.distances, self.next_hops = shortest_path_tables(graph)
+            ranking = closeness_ranking(self.distances)
+        else:
+            self.nodes = list(graph.nodes)
+            self.node_indices = {node: i for i, node in enumerate(self.nodes)}
+            self.distances = self.next_hops = None
+            adjacency = adjacency_matrix(graph, self.nodes, self.node_indices)
+            ranking = estimated_closeness_ranking(adjacency, TABLE_MAX_NODES)
+
+        indptr, indices = csr_adjacency(graph, self.nodes, self.node_indices)
+        self.neighbors = [node_neighbors.tolist() for node_neighbors in np.split(indices, indptr[1:-1])]
+        self.components = {node: i for i, component in enumerate(connected_components(graph)) for node in component}
+        self.nodes_by_centrality = [self.nodes[i] for i in ranking]
 
     def get_init_positions(self) -> list[int]:
         """Computes the initial cop positions.
@@ -40,11 +63,7 @@ class Cops(Player):
         if not self.cops_count:
             self.cops_count = 3
 
-        nodes_by_centrality = sorted(self.graph.nodes(),
-                                     key=self.centrality.get,
-                                     reverse=True)
-
-        self.cop_positions = nodes_by_centrality[:self.cops_count]
+        self.cop_positions = self.nodes_by_centrality[:self.cops_count]
 
         return self.cop_positions
 
@@ -56,36 +75,67 @@ class Cops(Player):
         """
         self.robber_position = robber_position
 
-        avail_cops = set(filter(lambda node: has_path(self.graph,
-                                                      node[1],
-                                                      robber_position),
-                                enumerate(self.cop_positions)))
+        robber_index = self.node_indices[robber_position]
+        robber_component = self.components[robber_position]
+        avail_cops = {(idx, pos) for idx, pos in enumerate(self.cop_positions)
+                      if self.components[pos] == robber_component}
         reserve_cops = set()
-        working_graph = self.graph.copy()
+        alive = bytearray(b'\x01') * len(self.nodes)
+        tables_exact = self.distances is not None
 
         while avail_cops:
-            idx, pos = sorted(avail_cops, key=lambda n:
-                              shortest_path_length(working_graph, n[1], robber_position))[0]
-            path: list[int] = shortest_path(working_graph, pos, robber_position)
-
-            if len(path) == 2:
-                self.cop_positions[idx] = path[1]
+            # As long as no node has been removed, the precomputed tables are
+            # exact and no search is necessary.
+            if tables_exact:
+                candidates = list(avail_cops)
+                cop_indices = [self.node_indices[pos] for _, pos in candidates]
+                closest = int(np.argmin(self.distances[cop_indices, robber_index]))
+                idx, pos = candidates[closest]
+                distance = self.distances[cop_indices[closest], robber_index]
+                next_pos = self.nodes[self.next_hops[cop_indices[closest], robber_index]]
+            else:
+                cop_paths = {cop: self.cop_path(self.node_indices[cop[1]], robber_index, alive) for cop in avail_cops}
+                idx, pos = min(cop_paths, key=lambda cop: cop_paths[cop][0])
+                distance, next_index = cop_paths[idx, pos]
+                next_pos = self.nodes[next_index]
+
+            if distance == 1:
+                self.cop_positions[idx] = next_pos
                 break
-            if len(path) > 2:
-                new_pos = path[1]
-                self.cop_positions[idx] = new_pos
-                working_graph.remove_node(new_pos)
 
             avail_cops.remove((idx, pos))
 
-            cut_off_cops = {cop for cop in avail_cops
-                            if not has_path(working_graph, cop[1], robber_position)}
-            avail_cops -= cut_off_cops
-            reserve_cops |= cut_off_cops
+            if distance > 1:
+                self.cop_positions[idx] = next_pos
+                alive[self.node_indices[next_pos]] = 0
+                tables_exact = False
+
+                # the cut-off cops are exactly those outside the part of the
+                # graph the robber can still reach, so a single sweep suffices
+                robber_reachable = reachable_nodes(self.neighbors, robber_index, alive)
+                cut_off_cops = {cop for cop in avail_cops if not robber_reachable[self.node_indices[cop[1]]]}
+                avail_cops -= cut_off_cops
+                reserve_cops |= cut_off_cops
 
+        alive = bytearray(b'\x01') * len(self.nodes)
         for idx, pos in reserve_cops:
-            path: list[int] = shortest_path(self.graph, pos, robber_position)
-            if len(path) >= 2:
-                self.cop_positions[idx] = path[1]
+            distance, next_index = self.cop_path(self.node_indices[pos], robber_index, alive)
+            if distance >= 1:
+                self.cop_positions[idx] = self.nodes[next_index]
 
         return self.cop_positions
+
+    def cop_path(self, cop_index: int, robber_index: int, alive: bytearray) -> tuple[int, int] | None:
+        """Computes the shortest path length and first hop from a cop to the robber using only alive nodes.
+
+        :param cop_index: The index of the cop position.
+        :param robber_index: The index of the robber position.
+        :param alive: A flag for every node index whether the path may visit it.
+        :return: The length of a shortest path and the index of its first node
+        after the cop position or None if there is no such path.
+        """
+        # the tabulated path is only invalidated if it runs through a removed node
+        if self.next_hops is not None and is_path_alive(self.next_hops, cop_index, robber_index, alive):
+            return self.distances[cop_index, robber_index], self.next_hops[cop_index, robber_index]
+
+        return bidirectional_search(self.neighbors, cop_index, robber_index, alive)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from math import inf
-
-from networkx import Graph, single_source_shortest_path_length
+import numpy as np
+from networkx import Graph
+from scipy.sparse.csgraph import dijkstra
 
 from .player import Player
+from .shortest_paths import adjacency_matrix
 
 
 class Robber(Player):
@@ -31,6 +32,14 @@ class Robber(Player):
         """
         super().__init__(graph, cops_count, timeout_init, timeout_step, max_rounds)
         self.graph = graph
+        self.nodes = list(graph.nodes)
+        self.node_indices = {node: i for i, node in enumerate(self.nodes)}
+        self.adjacency = adjacency_matrix(graph, self.nodes, self.node_indices)
+
+        # the nodes the robber can move to from every node (staying first) and their indices
+        self.moves = {node: (node, *graph.neighbors(node)) for node in graph}
+        self.move_indices = {node: np.array([self.node_indices[move] for move in moves], dtype=np.int64)
+                             for node, moves in self.moves.items()}
 
     def get_init_position(self, cop_positions: list[int]) -> int:
         """Computes the initial robber position.
@@ -40,13 +49,10 @@ class Robber(Player):
         """
         self.cop_positions = cop_positions
 
-        global_cop_dists = dict.fromkeys(self.graph, inf)
-
-        for cop_pos in cop_positions:
-            single_cop_dists = single_source_shortest_path_length(self.graph, cop_pos)
-            global_cop_dists = {k: min(v, single_cop_dists[k]) for k, v in global_cop_dists.items()}
+        # distance of every node to its closest cop (nodes no cop can reach are the farthest)
+        global_cop_dists = self.cop_distances(cop_positions)
 
-        self.robber_position = sorted(global_cop_dists.keys(), key=global_cop_dists.get, reverse=True)[0]
+        self.robber_position = self.nodes[int(np.argmax(global_cop_dists))]
 
         return self.robber_position
 
@@ -58,12 +64,24 @@ class Robber(Player):
         """
         self.cop_positions = cop_positions
 
-        global_cop_dists = dict.fromkeys(set(self.graph[self.robber_position]) | {self.robber_position}, inf)
+        # distance of every possible move to its closest cop
+        cop_dists = self.cop_distances(cop_positions)[self.move_indices[self.robber_position]]
 
-        for cop_pos in cop_positions:
-            single_cop_dists = single_source_shortest_path_length(self.graph, cop_pos)
-            global_cop_dists = {k: min(v, single_cop_dists[k]) for k, v in global_cop_dists.items()}
-
-        self.robber_position = sorted(global_cop_dists.keys(), key=global_cop_dists.get, reverse=True)[0]
+        self.robber_position = self.moves[self.robber_position][int(np.argmax(cop_dists))]
 
         return self.robber_position
+
+    def cop_distances(self, cop_positions: list[int]) -> np.ndarray:
+        """Computes the distance of every node to its closest cop.
+
+        A single multi-source search from all cops suffices, so no table of
+        pairwise distances has to be kept.
+
+        :param cop_positions: The current cop positions.
+        :return: The distance to the closest cop by node index, infinite for
+        nodes no cop can reach.
+        """
+        cop_indices = np.fromiter((self.node_indices[cop_pos] for cop_pos in cop_positions),
+                                  dtype=np.int64, count=len(cop_positions))
+
+        return dijkstra(self.adjacency, directed=False, unweighted=True, indices=cop_indices, min_only=True)
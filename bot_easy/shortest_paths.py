@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import numpy as np
+from networkx import Graph
+from scipy.sparse import csgraph, csr_array
+
+UNREACHABLE = np.iinfo(np.int16).max  # distance stored for pairs of nodes that are not connected
+TABLE_CHUNK_SIZE = 256  # number of target nodes whose shortest paths are computed at once
+TABLE_MAX_NODES = 2048  # number of nodes up to which the tables are precomputed (6 bytes per pair of nodes)
+
+
+def shortest_path_tables(graph: Graph,
+                         with_next_hops: bool = True
+                         ) -> tuple[list[int], dict[int, int], np.ndarray, np.ndarray | None]:
+    """Computes the shortest path lengths and first hops between all pairs of nodes.
+
+    The searches run in scipy on the CSR adjacency of the graph, a chunk of
+    target nodes at a time to bound the memory of the intermediate results.
+    The search from a target yields the predecessor of every node on its
+    shortest path towards the target. As the graph is undirected, that
+    predecessor is the first hop from the node to the target.
+
+    Nodes are addressed by their index in the returned node list. Pairs of
+    nodes that are not connected have the distance 'UNREACHABLE' and the first
+    hop -1. The first hop from a node to itself is the node itself.
+
+    The tables take quadratic memory and time, so callers should only build
+    them for graphs of up to 'TABLE_MAX_NODES' nodes. Distances are stored as
+    int16, so graphs with more than 'UNREACHABLE' nodes are rejected, as their
+    diameter might collide with the sentinel.
+
+    :param graph: The Graph to compute the tables for.
+    :param with_next_hops: Whether to compute the first hops as well. Without
+    them, the searches do not have to track predecessors at all.
+    :return: The list of nodes, a mapping from nodes to their indices, the
+    matrix of pairwise distances and the matrix of first hops (None if it was
+    not asked for).
+    :raises ValueError: If the graph has more than 'UNREACHABLE' nodes.
+    """
+    if len(graph) > UNREACHABLE:
+        raise ValueError(f"graphs with more than {UNREACHABLE} nodes do not fit into the distance table")
+
+    nodes = list(graph.nodes)
+    node_indices = {node: i for i, node in enumerate(nodes)}
+    n_nodes = len(nodes)
+    adjacency = adjacency_matrix(graph, nodes, node_indices)
+
+    distances = np.empty((n_nodes, n_nodes), dtype=np.int16)
+    next_hops = np.empty((n_nodes, n_nodes), dtype=np.int32) if with_next_hops else None
+
+    for chunk_start in range(0, n_nodes, TABLE_CHUNK_SIZE):
+        targets = np.arange(chunk_start, min(chunk_start + TABLE_CHUNK_SIZE, n_nodes))
+        result = csgraph.shortest_path(adjacency, method="D", directed=False, unweighted=True, indices=targets,
+                                       return_predecessors=with_next_hops)
+        target_distances, predecessors = result if with_next_hops else (result, None)
+
+        distances[targets] = np.where(np.isinf(target_distances), UNREACHABLE, target_distances)
+
+        if not with_next_hops:
+            continue
+
+        predecessors[predecessors < 0] = -1
+        predecessors[np.arange(len(targets)), targets] = targets
+        next_hops[:, targets] = predecessors.T
+
+    return nodes, node_indices, distances, next_hops
+
+
+def csr_adjacency(graph: Graph,
+                  nodes: list[int],
+                  node_indices: dict[int, int]) -> tuple[np.ndarray, np.ndarray]:
+    """Computes the CSR representation of the adjacency of a graph.
+
+    :param graph: The Graph to represent.
+    :param nodes: The nodes of the graph in the order of their indices.
+    :param node_indices: A mapping from nodes to their indices.
+    :return: The index pointers and the neighbor indices, i.e. the neighbors of
+    node i are indices[indptr[i]:indptr[i + 1]].
+    """
+    degrees = np.fromiter((len(graph[node]) for node in nodes), dtype=np.int64, count=len(nodes))
+    indptr = np.concatenate(([0], np.cumsum(degrees)))
+    indices = np.fromiter((node_indices[neighbor] for node in nodes for neighbor in graph.neighbors(node)),
+                          dtype=np.int32, count=indptr[-1])
+
+    return indptr, indices
+
+
+def adjacency_matrix(graph: Graph,
+                     nodes: list[int],
+                     node_indices: dict[int, int]) -> csr_array:
+    """Computes the sparse adjacency matrix of a graph as used by scipy's searches.
+
+    :param graph: The Graph to represent.
+    :param nodes: The nodes of the graph in the order of their indices.
+    :param node_indices: A mapping from nodes to their indices.
+    :return: The CSR matrix with a one for every pair of adjacent nodes.
+    """
+    indptr, indices = csr_adjacency(graph, nodes, node_indices)
+
+    return csr_array((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(len(nodes), len(nodes)))
+
+
+def closeness_ranking(distances: np.ndarray) -> np.ndarray:
+    """Ranks all nodes by their closeness centrality using the table of pairwise distances.
+
+    The centrality is the same as networkx' 'closeness_centrality', i.e. the
+    Wasserman and Faust variant that scales the closeness of nodes by the size
+    of their component. Since all distances are already known, no BFS has to
+    be run at all.
+
+    :param distances: The matrix of pairwise distances as computed by
+    'shortest_path_tables'.
+    :return: The indices of all nodes ordered by decreasing centrality, ties
+    keeping the order of the indices.
+    """
+    centrality = closeness_centrality(distances, len(distances))
+
+    return np.lexsort((np.arange(len(distances)), -centrality))
+
+
+def estimated_closeness_ranking(adjacency: csr_array, n_pivots: int) -> np.ndarray:
+    """Ranks all nodes by an estimate of their closeness centrality without a table of pairwise distances.
+
+    Instead of searching from every node, we only search from evenly spaced
+    pivot nodes. As the graph is undirected, the distances of a node to the
+    pivots of its component, scaled by the size of the component, estimate
+    the total distance of the node to its component (Eppstein and Wang). The
+    searches run a chunk of pivots at a time, so the memory stays linear in
+    the number of nodes. Nodes of components without pivots are ranked last.
+
+    :param adjacency: The adjacency matrix of the graph as computed by
+    'adjacency_matrix'.
+    :param n_pivots: The number of nodes to search from.
+    :return: The indices of all nodes ordered by decreasing estimated
+    centrality, ties keeping the order of the indices.
+    """
+    n_nodes = adjacency.shape[0]
+    pivots = np.unique(np.linspace(0, n_nodes - 1, min(n_pivots, n_nodes)).astype(np.int64))
+    _, components = csgraph.connected_components(adjacency, directed=False)
+    component_sizes = np.bincount(components)
+    component_pivots = np.bincount(components[pivots], minlength=len(component_sizes))
+
+    pivot_distances = np.zeros(n_nodes)
+    for chunk_start in range(0, len(pivots), TABLE_CHUNK_SIZE):
+        sources = pivots[chunk_start:chunk_start + TABLE_CHUNK_SIZE]
+        source_distances = csgraph.shortest_path(adjacency, method="D", directed=False, unweighted=True,
+                                                 indices=sources)
+        pivot_distances += np.where(np.isinf(source_distances), 0, source_distances).sum(axis=0)
+
+    n_reached = component_sizes[components]
+    n_node_pivots = component_pivots[components]
+    centrality = np.zeros(n_nodes)
+    connected = (pivot_distances > 0) & (n_node_pivots > 0)
+    total_distances = pivot_distances[connected] * n_reached[connected] / n_node_pivots[connected]
+    centrality[connected] = ((n_reached[connected] - 1) / total_distances
+                             * (n_reached[connected] - 1) / (n_nodes - 1))
+
+    return np.lexsort((np.arange(n_nodes), -centrality))
+
+
+def closeness_centrality(distances: np.ndarray, n_nodes: int) -> np.ndarray:
+    """Computes the closeness centrality of nodes from their distances to all nodes.
+
+    :param distances: The distances of some nodes (rows) to all nodes
+    (columns), 'UNREACHABLE' for pairs of nodes that are not connected.
+    :param n_nodes: The number of nodes of the graph.
+    :return: The closeness centrality of the nodes of the rows.
+    """
+    reachable = distances != UNREACHABLE
+    n_reached = reachable.sum(axis=1)
+    total_distances = np.where(reachable, distances, 0).sum(axis=1, dtype=np.int64)
+
+    centrality = np.zeros(len(distances))
+    connected = total_distances > 0
+    centrality[connected] = ((n_reached[connected] - 1) / total_distances[connected]
+                             * (n_reached[connected] - 1) / (n_nodes - 1))
+
+    return centrality
+
+
+def is_path_alive(next_hops: np.ndarray, source: int, target: int, alive: bytearray) -> bool:
+    """Checks whether the tabulated shortest path between two nodes only visits alive nodes.
+
+    Removing nodes can only make paths longer, so if the tabulated path
+    survives, it is still a shortest path.
+
+    :param next_hops: The matrix of first hops as computed by
+    'shortest_path_tables'.
+    :param source: The index of the node the path starts at.
+    :param target: The index of the node the path ends at.
+    :param alive: A flag for every node index whether the path may visit it.
+    :return: True if all nodes on the path are alive, False otherwise.
+    """
+    if next_hops[source, target] == -1:
+        return False
+
+    node = source
+    while alive[node] and node != target:
+        node = next_hops[node, target]
+
+    return bool(alive[node])
+
+
+def bidirectional_search(neighbors: list[list[int]],
+                         source: int,
+                         target: int,
+                         alive: bytearray) -> tuple[int, int] | None:
+    """Computes the shortest path length and first hop between two nodes using only alive nodes.
+
+    Two BFS are run simultaneously, one from the source and one from the
+    target, and we always expand the complete level of the smaller frontier.
+    The first node discovered by both searches lies on a shortest path, so the
+    searches only have to explore about half the distance each.
+
+    :param neighbors: The neighbor indices of every node.
+    :param source: The index of the node the path starts at.
+    :param target: The index of the node the path ends at.
+    :param alive: A flag for every node index whether the path may visit it.
+    :return: The length of a shortest path and the index of its first node
+    after the source (the source itself if it equals the target) or None if
+    there is no such path.
+    """
+    if not alive[source] or not alive[target]:
+        return None
+    if source == target:
+        return 0, source
+
+    n_nodes = len(neighbors)
+    forward_hops = [-1] * n_nodes  # first hop on the path from the source, -1 for undiscovered nodes
+    backward_seen = bytearray(n_nodes)
+    forward_hops[source] = source
+    backward_seen[target] = 1
+
+    forward_frontier = [source]
+    backward_frontier = [target]
+    distance = 1  # length of a path through an edge between both frontiers
+
+    while forward_frontier and backward_frontier:
+        next_frontier = []
+
+        if len(forward_frontier) <= len(backward_frontier):
+            for node in forward_frontier:
+                hop = forward_hops[node]
+                for neighbor in neighbors[node]:
+                    if forward_hops[neighbor] != -1 or not alive[neighbor]:
+                        continue
+
+                    forward_hops[neighbor] = neighbor if node == source else hop
+
+                    if backward_seen[neighbor]:
+                        return distance, forward_hops[neighbor]
+
+                    next_frontier.append(neighbor)
+
+            forward_frontier = next_frontier
+        else:
+            for node in backward_frontier:
+                for neighbor in neighbors[node]:
+                    if backward_seen[neighbor] or not alive[neighbor]:
+                        continue
+
+                    backward_seen[neighbor] = 1
+
+                    if forward_hops[neighbor] != -1:
+                        return distance, node if neighbor == source else forward_hops[neighbor]
+
+                    next_frontier.append(neighbor)
+
+            backward_frontier = next_frontier
+
+        distance += 1
+
+    return None
+
+
+def reachable_nodes(neighbors: list[list[int]], source: int, alive: bytearray) -> bytearray:
+    """Computes the nodes that can be reached from a node using only alive nodes.
+
+    :param neighbors: The neighbor indices of every node.
+    :param source: The index of the node to start at.
+    :param alive: A flag for every node index whether it may be visited.
+    :return: A flag for every node index whether it is reachable.
+    """
+    reached = bytearray(len(neighbors))
+
+    if not alive[source]:
+        return reached
+
+    reached[source] = 1
+    discovered_nodes = [source]
+
+    while discovered_nodes:
+        node = discovered_nodes.pop()
+
+        for neighbor in neighbors[node]:
+            if alive[neighbor] and not reached[neighbor]:
+                reached[neighbor] = 1
+                discovered_nodes.append(neighbor)
+
+    return reached
@@ -0,0 +1,30 @@
+import unittest
+from unittest import mock
+
+import networkx as nx
+
+from group3.bot_easy.cops import Cops
+
+
+class TestCops(unittest.TestCase):
+
+    def test_step_without_tables(self):
+        # cops on graphs too large for the tables search their paths and still move along shortest paths
+        graph = nx.disjoint_union(nx.connected_watts_strogatz_graph(30, 4, 0.3, seed=0), nx.path_graph(5))
+        distances = dict(nx.all_pairs_shortest_path_length(graph))
+
+        with mock.patch("group3.bot_easy.cops.TABLE_MAX_NODES", 0):
+            cops = Cops(graph, 3)
+
+        self.assertIsNone(cops.distances)
+        self.assertEqual(3, len(set(cops.get_init_positions())))
+
+        robber_position = 32
+        cops.cop_positions = [0, 30, 34]
+        cop_positions = list(cops.cop_positions)
+        new_positions = cops.step(robber_position)
+
+        # only the cops in the component of the robber move, each towards the robber
+        self.assertEqual(0, new_positions[0])
+        for old_position, new_position in zip(cop_positions[1:], new_positions[1:]):
+            self.assertEqual(distances[old_position][robber_position] - 1, distances[new_position][robber_position])
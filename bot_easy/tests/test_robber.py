@@ -0,0 +1,23 @@
+import unittest
+
+import networkx as nx
+
+from group3.bot_easy.robber import Robber
+
+
+class TestRobber(unittest.TestCase):
+
+    def test_get_init_position_disconnected(self):
+        # the robber starts in the component without cops instead of failing on nodes the cops cannot reach
+        graph = nx.disjoint_union(nx.path_graph(5), nx.cycle_graph(4))
+        robber = Robber(graph, 1)
+
+        self.assertIn(robber.get_init_position([2]), range(5, 9))
+        self.assertIn(robber.get_init_position([6]), range(5))
+
+    def test_get_init_position_connected(self):
+        graph = nx.path_graph(7)
+        robber = Robber(graph, 1)
+
+        self.assertEqual(6, robber.get_init_position([0]))
+        self.assertEqual(3, robber.get_init_position([1, 5]))
@@ -0,0 +1,152 @@
+import random
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from group3.bot_easy.shortest_paths import (UNREACHABLE, adjacency_matrix, bidirectional_search, closeness_ranking,
+                                            csr_adjacency, estimated_closeness_ranking, is_path_alive,
+                                            reachable_nodes, shortest_path_tables)
+
+
+def connected_graph() -> nx.Graph:
+    return nx.connected_watts_strogatz_graph(30, 4, 0.3, seed=0)
+
+
+def disconnected_graph() -> nx.Graph:
+    # a cycle, a path and an isolated node with labels that differ from the node indices
+    graph = nx.disjoint_union_all([nx.cycle_graph(7), nx.path_graph(5), nx.empty_graph(1)])
+    return nx.relabel_nodes(graph, {node: 3 * node + 10 for node in graph})
+
+
+def neighbor_lists(graph: nx.Graph, nodes: list[int], node_indices: dict[int, int]) -> list[list[int]]:
+    indptr, indices = csr_adjacency(graph, nodes, node_indices)
+    return [node_neighbors.tolist() for node_neighbors in np.split(indices, indptr[1:-1])]
+
+
+def alive_masks(n_nodes: int) -> list[bytearray]:
+    rng = random.Random(0)
+    masks = [bytearray([1]) * n_nodes]
+
+    for _ in range(5):
+        masks.append(bytearray(int(rng.random() > 0.2) for _ in range(n_nodes)))
+
+    return masks
+
+
+class TestShortestPaths(unittest.TestCase):
+
+    def setUp(self):
+        self.graphs = [connected_graph(), disconnected_graph()]
+
+    def test_shortest_path_tables(self):
+        for graph in self.graphs:
+            nodes, node_indices, distances, next_hops = shortest_path_tables(graph)
+            expected_distances = dict(nx.all_pairs_shortest_path_length(graph))
+
+            self.assertEqual(list(graph.nodes), nodes)
+
+            for u, i in node_indices.items():
+                for v, j in node_indices.items():
+                    if v not in expected_distances[u]:
+                        self.assertEqual(UNREACHABLE, distances[i, j])
+                        self.assertEqual(-1, next_hops[i, j])
+                    elif i == j:
+                        self.assertEqual(0, distances[i, j])
+                        self.assertEqual(i, next_hops[i, j])
+                    else:
+                        hop = next_hops[i, j]
+                        self.assertEqual(expected_distances[u][v], distances[i, j])
+                        self.assertIn(nodes[hop], graph[u])
+                        self.assertEqual(expected_distances[u][v] - 1, expected_distances[nodes[hop]][v])
+
+            _, _, distances_only, no_next_hops = shortest_path_tables(graph, with_next_hops=False)
+
+            self.assertIsNone(no_next_hops)
+            self.assertTrue((distances == distances_only).all())
+
+    def test_closeness_ranking(self):
+        for graph in self.graphs:
+            nodes, _, distances, _ = shortest_path_tables(graph)
+            ranking = closeness_ranking(distances)
+            expected_centrality = nx.closeness_centrality(graph)
+            centrality = [expected_centrality[nodes[i]] for i in ranking]
+
+            self.assertCountEqual(range(len(nodes)), ranking.tolist())
+            self.assertTrue(all(a >= b - 1e-12 for a, b in zip(centrality, centrality[1:])))
+
+    def test_estimated_closeness_ranking(self):
+        for graph in self.graphs:
+            nodes, node_indices, distances, _ = shortest_path_tables(graph)
+            adjacency = adjacency_matrix(graph, nodes, node_indices)
+
+            # with every node as a pivot, the estimate is exact
+            self.assertEqual(closeness_ranking(distances).tolist(),
+                             estimated_closeness_ranking(adjacency, len(nodes)).tolist())
+
+            ranking = estimated_closeness_ranking(adjacency, 4)
+            self.assertCountEqual(range(len(nodes)), ranking.tolist())
+
+    def test_is_path_alive(self):
+        graph = nx.path_graph(3)
+        nodes, node_indices, distances, next_hops = shortest_path_tables(graph)
+
+        self.assertTrue(is_path_alive(next_hops, 0, 2, bytearray([1, 1, 1])))
+        self.assertFalse(is_path_alive(next_hops, 0, 2, bytearray([1, 0, 1])))
+
+        for graph in self.graphs:
+            nodes, node_indices, distances, next_hops = shortest_path_tables(graph)
+
+            for alive in alive_masks(len(nodes)):
+                alive_graph = graph.subgraph(node for node, i in node_indices.items() if alive[i])
+
+                for i in range(len(nodes)):
+                    for j in range(len(nodes)):
+                        if not is_path_alive(next_hops, i, j, alive):
+                            continue
+
+                        # a surviving tabulated path is a shortest path among the alive nodes
+                        self.assertTrue(alive[i] and alive[j])
+                        self.assertEqual(distances[i, j],
+                                         nx.shortest_path_length(alive_graph, nodes[i], nodes[j]))
+
+    def test_bidirectional_search(self):
+        for graph in self.graphs:
+            nodes, node_indices, _, _ = shortest_path_tables(graph)
+            neighbors = neighbor_lists(graph, nodes, node_indices)
+
+            for alive in alive_masks(len(nodes)):
+                alive_graph = graph.subgraph(node for node, i in node_indices.items() if alive[i])
+                expected_distances = dict(nx.all_pairs_shortest_path_length(alive_graph))
+
+                for i, u in enumerate(nodes):
+                    for j, v in enumerate(nodes):
+                        result = bidirectional_search(neighbors, i, j, alive)
+
+                        if u not in expected_distances or v not in expected_distances[u]:
+                            self.assertIsNone(result)
+                            continue
+
+                        length, hop = result
+                        self.assertEqual(expected_distances[u][v], length)
+
+                        if i == j:
+                            self.assertEqual(i, hop)
+                        else:
+                            self.assertIn(nodes[hop], alive_graph[u])
+                            self.assertEqual(length - 1, expected_distances[nodes[hop]][v])
+
+    def test_reachable_nodes(self):
+        for graph in self.graphs:
+            nodes, node_indices, _, _ = shortest_path_tables(graph)
+            neighbors = neighbor_lists(graph, nodes, node_indices)
+
+            for alive in alive_masks(len(nodes)):
+                alive_graph = graph.subgraph(node for node, i in node_indices.items() if alive[i])
+
+                for i, u in enumerate(nodes):
+                    reached = reachable_nodes(neighbors, i, alive)
+                    actual = {nodes[j] for j in range(len(nodes)) if reached[j]}
+                    expected = nx.node_connected_component(alive_graph, u) if alive[i] else set()
+
+                    self.assertEqual(expected, actual)
@@ -3,7 +3,6 @@ from __future__ import annotations
 import math
 import random
 import time
-from collections import defaultdict
 from heapq import nlargest
 
 from networkx import Graph
@@ -17,11 +16,15 @@ from .player import Player
 
 
 class Cops(Player):
-    component_mapping: dict[int, Component]
+    component_mapping: dict[int, int]
     components: list[Component]
-    cop_distribution: dict[Component, float]
-    n_cops: dict[Component, int]
-    strategies: dict[Component, AbstractMinimaxDisjointRefinementCopsStrategy | None]
+    cop_distribution: list[float]
+    n_cops: list[int]
+    strategies: list[AbstractMinimaxDisjointRefinementCopsStrategy | None]
+    cop_positions: list[list[int]]
+    chained_positions: list[int]
+    component_slices: list[slice]
+    step_budget: float
 
     def __init__(self,
                  graph: Graph,
@@ -46,54 +49,74 @@ class Cops(Player):
         """
         super().__init__(graph, cops_count, timeout_init, timeout_step, max_rounds)
         finish_time = time.time() + (timeout_init if timeout_init is not None else 600)
+        self.step_budget = timeout_step if timeout_step is not None else 60  # seconds per 'step' and initial positions
 
-        self.component_mapping = Component.mapping(graph)
-        self.components = list(set(self.component_mapping.values()))
-        self.cop_distribution = component_cop_distribution(self.components)
+        # components are referred to by their index in the list of components
+        component_mapping = Component.mapping(graph)
+        self.components = list(set(component_mapping.values()))
+        component_ids = {component: i for i, component in enumerate(self.components)}
+        self.component_mapping = {node: component_ids[component] for node, component in component_mapping.items()}
+
+        cop_distribution = component_cop_distribution(self.components)
+        self.cop_distribution = [cop_distribution[component] for component in self.components]
 
         n_components = len(self.components)
 
         if cops_count < n_components:
-            self.n_cops = {}
+            self.n_cops = [0] * n_components
             n_remaining_cops = cops_count
 
-            for component in sorted(self.components, key=lambda c: c.graph.number_of_nodes()):
-                self.n_cops[component] = int(n_remaining_cops > 0)
+            for i in sorted(range(n_components), key=lambda c: self.components[c].graph.number_of_nodes()):
+                self.n_cops[i] = int(n_remaining_cops > 0)
                 n_remaining_cops -= 1
         else:
-            self.n_cops = {component: 1 for component in self.components}
+            self.n_cops = [1] * n_components
             n_remaining_cops = cops_count - n_components
 
-            for component, proportion in self.cop_distribution.items():
-                self.n_cops[component] += math.floor(n_remaining_cops * proportion)
+            for i, proportion in enumerate(self.cop_distribution):
+                self.n_cops[i] += math.floor(n_remaining_cops * proportion)
 
-            n_remaining_cops = cops_count - sum(self.n_cops.values())
-            fill_up_components = nlargest(n_remaining_cops, self.components, key=self.cop_distribution.get)
+            n_remaining_cops = cops_count - sum(self.n_cops)
+            fill_up_components = nlargest(n_remaining_cops, range(n_components), key=self.cop_distribution.__getitem__)
 
-            for component in fill_up_components:
-                self.n_cops[component] += 1
+            for i in fill_up_components:
+                self.n_cops[i] += 1
 
+        # we define strategies for all component for which we reserve at least one cop
+        # for other components there is no point in defining a strategy as there is no cop that could follow it
+        self.strategies = [None] * n_components
         component_finish_times = distribute_remaining_time(
             remaining_time(finish_time, 0.85),
             (component.graph.number_of_nodes() / graph.number_of_nodes() for component in self.components)
         )
 
-        # we define strategies for all component for which we reserve at least one cop
-        # for other components there is no point in defining a strategy as there is no cop that could follow it
-        self.strategies = defaultdict(lambda: None, {
-            component: AbstractMinimaxDisjointRefinementCopsStrategy(
-                component.graph,
-                self.n_cops[component],
-                component_finish_time
-            )
-            for component, component_finish_time in zip(self.components, component_finish_times)
-            if self.n_cops[component] > 0
-        })
-
-        self.cop_positions = {}
+        for i, (component, component_finish_time) in enumerate(zip(self.components, component_finish_times)):
+            if self.n_cops[i] > 0:
+                self.strategies[i] = AbstractMinimaxDisjointRefinementCopsStrategy(
+                    component.graph,
+                    self.n_cops[i],
+                    component_finish_time
+                )
+
+        self.cop_positions = [[] for _ in range(n_components)]
+        self.chained_positions = []
+        self.component_slices = [slice(0, 0)] * n_components
 
     def chained_cop_positions(self) -> list[int]:
-        return [cop_position for component in self.components for cop_position in self.cop_positions[component]]
+        return self.chained_positions.copy()
+
+    def chain_cop_positions(self):
+        """ Chains the cop positions of all components into one list.
+
+        We remember which slice of the chained positions belongs to which component, so that a step within one
+        component only needs to update its own slice.
+        """
+        self.chained_positions = []
+
+        for i, cop_positions in enumerate(self.cop_positions):
+            start = len(self.chained_positions)
+            self.chained_positions.extend(cop_positions)
+            self.component_slices[i] = slice(start, len(self.chained_positions))
 
     def get_init_positions(self) -> list[int]:
         """ Computes the initial cop positions.
@@ -107,27 +130,29 @@ class Cops(Player):
 
         :return: The initial cop positions.
         """
-        finish_time = time.time() + (self.timeout_step if self.timeout_step is not None else 60)
+        finish_time = time.time() + self.step_budget
 
-        for component in self.components:
-            n_cops = self.n_cops[component]
+        for i, component in enumerate(self.components):
+            n_cops = self.n_cops[i]
 
             # case 1: we have more cops reserved for an island than there are nodes in that component
             # we let the cops cover all nodes
             if n_cops >= component.graph.number_of_nodes():
                 nodes = list(component.graph.nodes)
                 fill_up_nodes = [random.choice(nodes)] * (n_cops - len(nodes))
-                self.cop_positions[component] = nodes + fill_up_nodes
+                self.cop_positions[i] = nodes + fill_up_nodes
             # case 2: we have at least one cop reserved for an island but cannot cover all nodes in that component
             # we choose the initial cop positions according to the strategy for that component
-            elif self.n_cops[component] > 0:
-                self.cop_positions[component] = self.strategies[component].init(
-                    remaining_time(finish_time, 0.75 * self.cop_distribution[component])
+            elif n_cops > 0:
+                self.cop_positions[i] = self.strategies[i].init(
+                    remaining_time(finish_time, 0.75 * self.cop_distribution[i])
                 )
             # case 3: we have no cops reserved for an island
             # we choose no initial positions as there are no cops to place
             else:
-                self.cop_positions[component] = []
+                self.cop_positions[i] = []
+
+        self.chain_cop_positions()
 
         return self.chained_cop_positions()
 
@@ -141,8 +166,8 @@ class Cops(Player):
         :param robber_position: The current robber position.
         :return: The next cop positions.
         """
-        finish_time = time.time() + (self.timeout_step if self.timeout_step is not None else 60)
-        component = self.component_mapping[robber_position]  # island on which the robber is located
+        finish_time = time.time() + self.step_budget
+        component = self.component_mapping[robber_position]  # index of the island on which the robber is located
         cop_positions = self.cop_positions[component]  # cop positions in the robber island
 
         if robber_position not in cop_positions:  # only make a move if the robber is not yet caught
@@ -151,10 +176,11 @@ class Cops(Player):
             # take a step in the robber island
             # the strategy for the robber island is not defined if there are no cops on that island
             if strategy is not None:
-                self.cop_positions[component] = self.strategies[component].step(
+                self.cop_positions[component] = strategy.step(
                     cop_positions,
                     robber_position,
                     remaining_time(finish_time, 0.75)
                 )
+                self.chained_positions[self.component_slices[component]] = self.cop_positions[component]
 
         return self.chained_cop_positions()
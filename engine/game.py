@@ -50,6 +50,11 @@ class Game(GenericGame):
                          timeout_step,
                          max_rounds)
 
+        # the nodes every node can move to (including itself) for validating moves
+        # this cache is only valid because the graph topology does not change during a game, so it must be rebuilt if
+        # the graph is ever modified
+        self._closed_neighborhoods = {node: frozenset(self.graph[node]) | {node} for node in self.graph}
+
         if self.status is not Status.GAME_CONTINUES:
             return
 
@@ -73,9 +78,27 @@ class Game(GenericGame):
         In any of those cases, except for an illegal type, the result is stored
         before the game ends.
         """
+        closed_neighborhoods = self._closed_neighborhoods
+        old_positions = self._cop_positions if self._cop_positions is not None else []
+        n_old_positions = len(old_positions)
+        has_invalid_type = not isinstance(positions, list)
+        has_outside_position = has_illegal_move = False
+
+        # Check the type, the membership in the graph and the legality of all
+        # positions in a single pass. The details for the log are only
+        # collected in case of failure.
+        if not has_invalid_type:
+            for i, pos in enumerate(positions):
+                if not isinstance(pos, int):
+                    has_invalid_type = True
+                    break
+                if pos not in closed_neighborhoods:
+                    has_outside_position = True
+                elif i < n_old_positions and pos not in closed_neighborhoods.get(old_positions[i], ()):
+                    has_illegal_move = True
+
         # Check if type of new positions is 'list[int]'.
-        if not isinstance(positions, list) \
-                or not all(isinstance(pos, int) for pos in positions):
+        if has_invalid_type:
             self.status = Status.COPS_INVALID_STEP
             self.logger.warning("Cops returned an invalid type & lost. "
                                 "Returned type: %s.", type(positions)
@@ -96,23 +119,19 @@ class Game(GenericGame):
                                 self.cops_count, len(positions))
 
         # Check if all positions are inside the graph.
-        elif not all(pos in self.graph for pos in positions):
+        elif has_outside_position:
             self.status = Status.COPS_INVALID_STEP
             self.logger.warning("Cops returned a position outside the graph & lost. "
                                 "Illegal positions: %s.",
-                                [pos for pos in positions if pos not in self.graph])
+                                [pos for pos in positions if pos not in closed_neighborhoods])
 
         # Check if every position is a legal move.
-        elif self._cop_positions is not None \
-                and not all(old_pos == new_pos
-                            or self.graph.has_edge(old_pos, new_pos)
-                            for old_pos, new_pos in zip(self._cop_positions, positions)):
+        elif has_illegal_move:
             self.status = Status.COPS_INVALID_STEP
             self.logger.warning("Cops made an illegal move & lost. Illegal moves: %s.",
                                 [f'{old_pos} -> {new_pos}' for old_pos, new_pos
-                                 in zip(self._cop_positions, positions)
-                                 if old_pos != new_pos
-                                 and not self.graph.has_edge(old_pos, new_pos)])
+                                 in zip(old_positions, positions)
+                                 if new_pos not in closed_neighborhoods.get(old_pos, ())])
 
         self._cop_positions = positions.copy()
         self.logger.info("Cop positions set to: %s.", positions)
@@ -138,15 +157,14 @@ class Game(GenericGame):
             return
 
         # Check if the position is inside the graph.
-        if position not in self.graph:
+        if position not in self._closed_neighborhoods:
             self.status = Status.ROBBER_INVALID_STEP
             self.logger.warning("Robber returned a position outside the graph & lost. "
                                 "Illegal position: %s.", position)
 
         # Check if the position is a legal move.
         elif self._robber_position is not None \
-                and self._robber_position != position \
-                and not self.graph.has_edge(self._robber_position, position):
+                and position not in self._closed_neighborhoods[self._robber_position]:
             self.status = Status.ROBBER_INVALID_STEP
             self.logger.warning("Robber made an illegal move & lost. "
                                 "Illegal move: %s -> %s.",
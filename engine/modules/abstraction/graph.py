@@ -1,50 +1,93 @@
 from __future__ import annotations
 
-from collections import defaultdict
 from itertools import chain
 from typing import Iterable
 
+import numpy as np
 from networkx import Graph
+from scipy.sparse import coo_array, csr_array, triu
 
 from .pooling import abstract_vertex_pooling
 from .store import ShortestPathLengthStore, UndominatedNeighborhoodEdgeRankStore
+from ..util import csr_adjacency
 
 
 class GraphAbstraction:
+    __slots__ = (
+        "graph",
+        "adjacency",
+        "vertex_mapping",
+        "inverse_vertex_mapping",
+        "literal_vertex_mapping",
+        "inverse_literal_vertex_mapping",
+        "n_nodes",
+        "n_edges",
+        "shortest_path_lengths",
+        "undominated_neighborhood_ranks",
+    )
+
     graph: Graph
+    adjacency: csr_array
     vertex_mapping: dict[int, int]
-    inverse_vertex_mapping: dict[int, list[int]]
+    inverse_vertex_mapping: list[list[int]]
     literal_vertex_mapping: dict[int, int]
-    inverse_literal_vertex_mapping: dict[int, list[int]]
+    inverse_literal_vertex_mapping: list[list[int]]
     n_nodes: int
     n_edges: int
 
     shortest_path_lengths: ShortestPathLengthStore
     undominated_neighborhood_ranks: UndominatedNeighborhoodEdgeRankStore
 
-    def __init__(self, graph: Graph, prior_literal_vertex_mapping: dict[int, int]):
-        self.vertex_mapping = abstract_vertex_pooling(graph)
-        self.inverse_vertex_mapping = defaultdict(list)
+    def __init__(
+        self,
+        graph: Graph,
+        prior_literal_vertex_mapping: dict[int, int] | None = None,
+        adjacency: csr_array | None = None
+    ):
+        nodes = list(graph.nodes)
+        if adjacency is None:
+            _, _, adjacency = csr_adjacency(graph)
+
+        self.vertex_mapping = abstract_vertex_pooling(graph, adjacency)
+        n_abstract_nodes = max(self.vertex_mapping.values(), default=-1) + 1  # abstract nodes are 0, ..., n - 1
 
+        self.inverse_vertex_mapping = [[] for _ in range(n_abstract_nodes)]
         for node, abstract_node in self.vertex_mapping.items():
             self.inverse_vertex_mapping[abstract_node].append(node)
 
-        self.literal_vertex_mapping = {
-            node: self.vertex_mapping[prior_literal_vertex_mapping[node]]
-            for node in prior_literal_vertex_mapping
-        }
-
-        self.inverse_literal_vertex_mapping = defaultdict(list)
-        for node, abstract_node in self.literal_vertex_mapping.items():
-            self.inverse_literal_vertex_mapping[abstract_node].append(node)
-
+        if prior_literal_vertex_mapping is None:
+            # the graph is the literal graph itself, so the literal mappings coincide with the vertex mappings
+            self.literal_vertex_mapping = self.vertex_mapping
+            self.inverse_literal_vertex_mapping = self.inverse_vertex_mapping
+        else:
+            self.literal_vertex_mapping = {
+                node: self.vertex_mapping[prior_literal_vertex_mapping[node]]
+                for node in prior_literal_vertex_mapping
+            }
+
+            self.inverse_literal_vertex_mapping = [[] for _ in range(n_abstract_nodes)]
+            for node, abstract_node in self.literal_vertex_mapping.items():
+                self.inverse_literal_vertex_mapping[abstract_node].append(node)
+
+        # many edges of the graph map to the same abstract edge, so we collect the abstract edges in a sparse adjacency
+        # matrix that coalesces duplicates and only then convert it into a graph
+        # (the adjacency is kept so that the next abstraction can pool its nodes without querying the graph again)
+        abstract_nodes = np.fromiter(map(self.vertex_mapping.__getitem__, nodes), dtype=np.int64, count=len(nodes))
+        abstract_us = np.repeat(abstract_nodes, np.diff(adjacency.indptr))
+        abstract_vs = abstract_nodes[adjacency.indices]
+        distinct = abstract_us != abstract_vs
+
+        self.adjacency = coo_array(
+            (np.ones(np.count_nonzero(distinct), dtype=np.int32), (abstract_us[distinct], abstract_vs[distinct])),
+            shape=(n_abstract_nodes, n_abstract_nodes)
+        ).tocsr()
+        self.adjacency.data[:] = 1
+
+        # every undirected edge is added once from the upper triangle, without a weight attribute
         self.graph = Graph()
-        self.graph.add_nodes_from(self.vertex_mapping.values())
-        self.graph.add_edges_from(
-            (abstract_u, abstract_v)
-            for u, v in graph.edges
-            if (abstract_u := self.vertex_mapping[u]) != (abstract_v := self.vertex_mapping[v])
-        )
+        self.graph.add_nodes_from(range(n_abstract_nodes))
+        us, vs = triu(self.adjacency).nonzero()
+        self.graph.add_edges_from(zip(us.tolist(), vs.tolist()))
 
         self.n_nodes = self.graph.number_of_nodes()
         self.n_edges = self.graph.number_of_edges()
@@ -69,7 +112,7 @@ class GraphAbstraction:
         return self.literal_vertex_mapping[literal_node]
 
     def abstract_nodes(self, literal_nodes: Iterable[int]) -> list[int]:
-        return [self.abstract_node(literal_node) for literal_node in literal_nodes]
+        return list(map(self.literal_vertex_mapping.__getitem__, literal_nodes))
 
     def __hash__(self):
         return hash(("GraphAbstraction", self.n_nodes, self.n_edges))
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from typing import Callable
 
+import numpy as np
 from networkx import Graph
 
 from .graph import GraphAbstraction
@@ -15,6 +17,10 @@ class AbstractionHierarchy:
     graph: Graph
     abstractions: list[GraphAbstraction]
     literal_vertex_mappings: list[dict[int, int]]
+    highest_first_abstractions: list[GraphAbstraction]
+    highest_first_sizes: list[int]
+    literal_node_indices: dict[int, int]
+    highest_first_literal_vertex_mappings: np.ndarray
 
     @property
     def highest_abstraction(self) -> GraphAbstraction:
@@ -27,13 +33,25 @@ class AbstractionHierarchy:
     def __init__(self, graph: Graph):
         self.graph = graph
 
-        literal_vertex_mapping = {node: node for node in graph.nodes}
-        self.abstractions = [abstraction := GraphAbstraction(graph, literal_vertex_mapping)]
+        self.abstractions = [abstraction := GraphAbstraction(graph)]
 
         while abstraction.n_nodes > ABSTRACTION_SIZE_THRESHOLD:
-            abstraction = GraphAbstraction(abstraction.graph, abstraction.literal_vertex_mapping)
+            abstraction = GraphAbstraction(abstraction.graph, abstraction.literal_vertex_mapping, abstraction.adjacency)
             self.abstractions.append(abstraction)
 
+        # abstractions from the highest to the lowest along with their increasing numbers of nodes to bisect on
+        self.highest_first_abstractions = self.abstractions[::-1]
+        self.highest_first_sizes = [abstraction.n_nodes for abstraction in self.highest_first_abstractions]
+
+        # literal vertex mappings of all abstractions stacked into one matrix, one row per abstraction and one column
+        # per literal node, so that positions can be mapped to all abstractions at once
+        self.literal_node_indices = {node: i for i, node in enumerate(graph.nodes)}
+        self.highest_first_literal_vertex_mappings = np.empty((len(self.abstractions), len(self.literal_node_indices)),
+                                                              dtype=np.int32)
+        for mapping, abstraction in zip(self.highest_first_literal_vertex_mappings, self.highest_first_abstractions):
+            mapping[:] = np.fromiter(map(abstraction.literal_vertex_mapping.__getitem__, graph.nodes),
+                                     dtype=np.int32, count=len(mapping))
+
     def populate_shortest_path_lengths(self, finish_time: float):
         for abstraction in reversed(self.abstractions):
             if not abstraction.populate_shortest_path_lengths(finish_time):
@@ -61,18 +79,23 @@ class AbstractionHierarchy:
         return self.lowest_fitting_abstraction(has_shortest_path_lengths)
 
     def highest_undecided_abstraction(self, cop_positions: list[int], robber_position: int) -> GraphAbstraction | None:
-        def is_undecided(abstraction: GraphAbstraction) -> bool:
-            abstract_robber_position = abstraction.literal_vertex_mapping[robber_position]
-            abstract_cop_positions = map(abstraction.literal_vertex_mapping.__getitem__, cop_positions)
-            return abstract_robber_position not in abstract_cop_positions
+        cop_indices = [self.literal_node_indices[cop_position] for cop_position in cop_positions]
+        robber_index = self.literal_node_indices[robber_position]
+
+        # an abstraction is decided if the robber shares an abstract node with any cop
+        mappings = self.highest_first_literal_vertex_mappings
+        decided = (mappings[:, cop_indices] == mappings[:, [robber_index]]).any(axis=1)
+        highest_undecided = int(decided.argmin())
 
-        return self.highest_fitting_abstraction(is_undecided)
+        return None if decided[highest_undecided] else self.highest_first_abstractions[highest_undecided]
 
     def highest_abstraction_lower_than(self, abstraction: GraphAbstraction) -> GraphAbstraction | None:
-        return self.highest_fitting_abstraction(lambda x: x.n_nodes > abstraction.n_nodes)
+        i = bisect_right(self.highest_first_sizes, abstraction.n_nodes)
+        return self.highest_first_abstractions[i] if i < len(self.highest_first_abstractions) else None
 
     def lowest_abstraction_higher_than(self, abstraction: GraphAbstraction) -> GraphAbstraction | None:
-        return self.highest_fitting_abstraction(abstraction.__gt__)
+        i = bisect_left(self.highest_first_sizes, abstraction.n_nodes)
+        return self.highest_first_abstractions[i - 1] if i > 0 else None
 
     def decreasing_abstractions_from(self, abstraction: GraphAbstraction) -> list[GraphAbstraction]:
-        return list(filter(abstraction.__le__, reversed(self.abstractions)))
+        return self.highest_first_abstractions[bisect_left(self.highest_first_sizes, abstraction.n_nodes):]
@@ -1,12 +1,13 @@
 import math
-from heapq import heapify, heappop
-from statistics import geometric_mean
 
 import numpy as np
 from networkx import Graph
+from scipy.sparse import csr_array
 
+from ..util import csr_adjacency
 
-def abstract_vertex_pooling(graph: Graph) -> dict[int, int]:
+
+def abstract_vertex_pooling(graph: Graph, adjacency: csr_array | None = None) -> dict[int, int]:
     """ Computes a structure-preserving abstraction of a graph.
 
     The abstraction is computed as a mapping from nodes to abstract nodes where sets of nodes are contracted into one
@@ -29,127 +30,157 @@ def abstract_vertex_pooling(graph: Graph) -> dict[int, int]:
     abstract nodes based on the links between the nodes that constitute them is connected again.
 
     :param graph: The connected graph to be abstracted.
+    :param adjacency: The adjacency matrix of the graph in CSR format with nodes addressed by their index in the order of
+    the graph, if already at hand (e.g., from the abstraction of a lower level). Computed from the graph otherwise.
     :return: A mapping from nodes to abstract nodes that cuts the number of nodes in half.
     """
-    nodes = [node for node in graph.nodes]
+    nodes = list(graph.nodes)
     n_nodes = len(nodes)
-    node_indices = {node: i for i, node in enumerate(graph.nodes)}
-
-    uf_parents = np.arange(n_nodes)  # parent pointers of the union-find data structure
-    uf_rank = np.ones(n_nodes, dtype=np.int32)  # rank of the union-find data structure
-
-    def union(_u: int, _v: int):
-        """ Performs a union operation in the union-find data structure.
-
-        We join the two sets corresponding to the input elements by joining their root set representatives.
-        We use rank compression to keep the union-find tree height small.
-
-        :param _u: An element within the data structure (must be in {0, ..., n - 1}).
-        :param _v: Another element to join sets with the first one (must be in {0, ..., n - 1} as well).
-        """
-        # find roots of the input elements
-        _u = find(_u)
-        _v = find(_v)
-
-        # join the roots by rank
-        if uf_rank[_u] > uf_rank[_v]:
-            uf_parents[_v] = _u
-        elif uf_rank[_u] < uf_rank[_v]:
-            uf_parents[_u] = _v
-        else:
-            uf_parents[_v] = _u
-            uf_rank[_u] += 1
 
-    def find(_v: int) -> int:
-        """ Performs a find operation in the union-find data structure.
+    if adjacency is None:
+        _, _, adjacency = csr_adjacency(graph)
 
-        We find the root representative of the input by traversing up the union-find tree to its root.
-        We use path compression to decrease the height of the tree amortizing the complexity of the operation to be
-        almost constant on average.
+    # the neighbors of node index i are indices[indptr[i]:indptr[i + 1]]
+    indptr = adjacency.indptr
+    indices = adjacency.indices
+    rows = np.repeat(np.arange(n_nodes, dtype=indices.dtype), np.diff(indptr))
 
-        :param _v: An element within the data structure (must be in {0, ..., n - 1}).
-        :return: The root set representative of the element (index in {0, ..., n - 1}).
-        """
-        while uf_parents[_v] != _v:  # search for root element
-            _v = uf_parents[_v] = uf_parents[uf_parents[_v]]  # move up to parent using path compression
-        return _v
+    uf_parents = list(range(n_nodes))  # parent pointers of the union-find data structure
+    uf_rank = [1] * n_nodes  # rank of the union-find data structure
 
     n_abstract_nodes = n_nodes  # keeps track of number of abstract nodes present after the pooling
     target_n_abstract_nodes = math.ceil(n_nodes / 2)  # desired number of nodes in the abstract graph
-    marked = np.full(n_nodes, False)  # stores whether a node has been already contracted with another node
-
-    def geometric_mean_degree(_u: int, _v: int) -> float:
-        """ Computes the geometric mean degree of two nodes.
-
-        A low geometric mean degree between two adjacent nodes indicates a characteristic neighborhood
-        between those nodes as they are neighbors, although they have few neighbors. The geometric mean is
-        chosen because it is only little affected by outliers.
-
-        :param _u: One node in the input graph.
-        :param _v: Another node in the input graph.
-        :return: The geometric mean of the degrees of the input nodes.
-        """
-        return geometric_mean((graph.degree[nodes[_u]], graph.degree[nodes[_v]]))
-
-    def make_mean_degree_edge_tuple(_u: int, _v: int) -> tuple[float, int, int]:
-        return geometric_mean_degree(_u, _v), _u, _v
-
-    def perform_vertex_pooling(strict: bool, mean_degree_edge_tuples: list[tuple[float, int, int]]):
-        """ Contracts vertices based on their mean degree.
+    marked = bytearray(n_nodes)  # stores whether a node has been already contracted with another node (one byte each)
 
-        We iterate over all given edges in non-decreasing order of the geometric mean degree of their incident
-        vertices. As long as there are nodes left to contract and too many abstract nodes, we contract the
-        adjacent nodes which decreases the number of abstract nodes by one.
+    # a low geometric mean degree between two adjacent nodes indicates a characteristic neighborhood between those nodes
+    # as they are neighbors, although they have few neighbors. The geometric mean is chosen because it is only little
+    # affected by outliers. As the square root is monotone, we order by the product of the degrees instead.
+    # (self-loops count twice towards the degree but only have one entry in the adjacency)
+    degrees = np.diff(indptr) + np.bincount(rows[rows == indices], minlength=n_nodes)
 
-        In strict mode, we only contract two adjacent nodes if they both have not yet been contracted (i.e., are not
-        marked). Otherwise, we only contract two adjacent nodes if one of them is marked and the other is not.
+    def contract(strict: bool, us: np.ndarray, vs: np.ndarray):
+        """ Contracts the given edges in non-decreasing order of the geometric mean degree of their incident vertices.
 
         :param strict: Boolean indicating whether to contract in strict mode.
-        :param mean_degree_edge_tuples: Tuple (metric, u, v) where nodes u and v are contracted in order of the metric.
+        :param us: First nodes of the edges as node indices.
+        :param vs: Second nodes of the edges as node indices.
         """
         nonlocal n_abstract_nodes
-        heapify(mean_degree_edge_tuples)
 
-        while mean_degree_edge_tuples and n_abstract_nodes > target_n_abstract_nodes:
-            _, u, v = heappop(mean_degree_edge_tuples)  # get edge {u, v} with minimal geometric mean degree of the nodes
+        metrics = degrees[us] * degrees[vs]
+        order = np.lexsort((vs, us, metrics))  # sort lexicographically by (metric, u, v)
 
-            # if in strict mode, we require both nodes to be unmarked
-            # if not in strict mode, we require exactly one node to be unmarked
-            # if either of the condition is not given, we ignore the edge and move on to the next edge
-            if (strict and (marked[u] or marked[v])) or (not strict and not (marked[u] ^ marked[v])):
-                continue
-
-            union(u, v)  # contracts u and v by joining their respective node sets in the union-find data structure
-            n_abstract_nodes -= 1  # contracting two nodes removes exactly one abstract vertex
-
-            # mark both vertices as having been contracted at least once
-            marked[u] = True
-            marked[v] = True
+        n_abstract_nodes = contract_vertex_pairs(
+            uf_parents, uf_rank, marked, us[order].tolist(), vs[order].tolist(),
+            strict, n_abstract_nodes, target_n_abstract_nodes
+        )
 
     # Phase 1: Contract pairs of adjacent unmarked nodes
-    perform_vertex_pooling(True, [
-        make_mean_degree_edge_tuple(node_indices[u], node_indices[v])
-        for u, v in graph.edges
-        if u != v
-    ])
+    upper = rows < indices  # every edge once (u < v) without self-loops
+    contract(True, rows[upper], indices[upper])
 
     # Phase 2: If there are still too many nodes, contract pairs of adjacent nodes where one is marked and one is not
     # We do this because it might be the case that no pair of adjacent unmarked nodes ist left to contract, but we
     # haven't yet reached the desired small number of abstracted nodes
     if n_abstract_nodes > target_n_abstract_nodes:
-        unmarked_nodes, = np.where(~marked)  # indices of nodes that are not marked yet
+        is_marked = np.frombuffer(marked, dtype=bool)  # view on the flags without copying them
 
         # contract unmarked nodes with adjacent marked nodes
-        perform_vertex_pooling(False, [
-            make_mean_degree_edge_tuple(unmarked_node_index, marked_neighbor_index)
-            for unmarked_node_index in unmarked_nodes
-            for neighbor in graph.neighbors(nodes[unmarked_node_index])
-            if marked[marked_neighbor_index := node_indices[neighbor]]
-        ])
+        unmarked_marked = ~is_marked[rows] & is_marked[indices]
+        contract(False, rows[unmarked_marked], indices[unmarked_marked])
+
+    # find the roots of all nodes at once by letting every node jump to its grandparent until all parents are roots
+    # (this takes a logarithmic number of vectorized passes as the union-find trees are balanced by rank)
+    roots = np.array(uf_parents, dtype=np.int64)
+    while not np.array_equal(grandparents := roots[roots], roots):
+        roots = grandparents
 
     # map each vertex to its contracted abstract node where the abstract nodes
-    uf_roots = set(find(node) for node in uf_parents)
-    root_indices = {root: i for i, root in enumerate(uf_roots)}
-    abstract_node_mapping = {node: root_indices[find(i)] for i, node in enumerate(nodes)}
+    uf_roots = set(roots.tolist())
+    root_indices = np.empty(n_nodes, dtype=np.int64)
+    root_indices[list(uf_roots)] = np.arange(len(uf_roots))
+    abstract_node_mapping = dict(zip(nodes, root_indices[roots].tolist()))
 
     return abstract_node_mapping
+
+
+def find(uf_parents: list[int], v: int) -> int:
+    """ Performs a find operation in a union-find data structure.
+
+    We find the root representative of the input by traversing up the union-find tree to its root.
+    We use path halving to decrease the height of the tree amortizing the complexity of the operation to be
+    almost constant on average.
+
+    :param uf_parents: The parent pointers of the union-find data structure.
+    :param v: An element within the data structure (must be in {0, ..., n - 1}).
+    :return: The root set representative of the element (index in {0, ..., n - 1}).
+    """
+    while (parent := uf_parents[v]) != v:  # search for root element
+        uf_parents[v] = uf_parents[parent]  # let the element skip its parent (path halving)
+        v = uf_parents[v]  # move up to the former grandparent
+    return v
+
+
+def contract_vertex_pairs(
+    uf_parents: list[int],
+    uf_rank: list[int],
+    marked: bytearray,
+    us: list[int],
+    vs: list[int],
+    strict: bool,
+    n_abstract_nodes: int,
+    target_n_abstract_nodes: int
+) -> int:
+    """ Contracts vertices in the given order.
+
+    We iterate over the given edges in order. As long as there are nodes left to contract and too many abstract nodes,
+    we contract the adjacent nodes which decreases the number of abstract nodes by one.
+
+    In strict mode, we only contract two adjacent nodes if they both have not yet been contracted (i.e., are not
+    marked). Otherwise, we only contract two adjacent nodes if one of them is marked and the other is not.
+
+    Contracting two nodes joins their sets in the union-find data structure by joining their root set representatives.
+    We use union by rank to keep the union-find tree height small.
+
+    The loop only works on plain lists of integers, which is considerably faster than indexing NumPy arrays with
+    scalars in the interpreter.
+
+    :param uf_parents: The parent pointers of the union-find data structure.
+    :param uf_rank: The ranks of the union-find data structure.
+    :param marked: Stores whether a node has been already contracted with another node.
+    :param us: First nodes of the edges to contract in the order in which to contract them.
+    :param vs: Second nodes of the edges to contract in the order in which to contract them.
+    :param strict: Boolean indicating whether to contract in strict mode.
+    :param n_abstract_nodes: The number of abstract nodes before the contraction.
+    :param target_n_abstract_nodes: The desired number of abstract nodes.
+    :return: The number of abstract nodes after the contraction.
+    """
+    for u, v in zip(us, vs):
+        if n_abstract_nodes <= target_n_abstract_nodes:
+            break
+
+        # if in strict mode, we require both nodes to be unmarked
+        # if not in strict mode, we require exactly one node to be unmarked
+        # if either of the condition is not given, we ignore the edge and move on to the next edge
+        if (strict and (marked[u] or marked[v])) or (not strict and marked[u] == marked[v]):
+            continue
+
+        # contract u and v by joining the roots of their respective node sets by rank
+        root_u = find(uf_parents, u)
+        root_v = find(uf_parents, v)
+
+        if uf_rank[root_u] > uf_rank[root_v]:
+            uf_parents[root_v] = root_u
+        elif uf_rank[root_u] < uf_rank[root_v]:
+            uf_parents[root_u] = root_v
+        else:
+            uf_parents[root_v] = root_u
+            uf_rank[root_u] += 1
+
+        n_abstract_nodes -= 1  # contracting two nodes removes exactly one abstract vertex
+
+        # mark both vertices as having been contracted at least once
+        marked[u] = 1
+        marked[v] = 1
+
+    return n_abstract_nodes
@@ -2,9 +2,13 @@ import math
 from abc import ABC, abstractmethod
 from typing import final
 
-from networkx import Graph, shortest_path_length
+import numpy as np
+from networkx import Graph
+from scipy.sparse.csgraph import shortest_path
 
-from ..util import timeout_loop
+from ..util import csr_adjacency, timeout_loop
+
+SHORTEST_PATH_CHUNK_SIZE = 64  # number of sources whose distances are computed at once
 
 
 class Store(ABC):
@@ -24,52 +28,87 @@ class Store(ABC):
 
 
 class ShortestPathLengthStore(Store):
-    pairwise_distances: dict[int, dict[int, int]]
+    distance_matrix: np.ndarray
+    node_indices: dict[int, int]
 
     def _populate(self, graph: Graph, finish_time: float, *args, **kwargs) -> bool:
-        self.pairwise_distances = {}
+        nodes, self.node_indices, adjacency = csr_adjacency(graph)
+        n_nodes = len(nodes)
 
-        @timeout_loop(finish_time)
-        def populate_single_source_distances(source: int):
-            self.pairwise_distances[source] = shortest_path_length(graph, source)
+        # distances between the nodes with the respective indices, -1 for nodes that are not connected
+        self.distance_matrix = np.full((n_nodes, n_nodes), -1, dtype=np.int32)
 
-        for node in graph.nodes:
-            if not populate_single_source_distances(node):
+        @timeout_loop(finish_time)
+        def populate_multi_source_distances(sources: np.ndarray):
+            # the searches for a whole chunk of sources run in C at once
+            distances = shortest_path(adjacency, method="D", directed=False, unweighted=True, indices=sources)
+            self.distance_matrix[sources] = np.where(np.isfinite(distances), distances, -1)
+
+        for chunk_start in range(0, n_nodes, SHORTEST_PATH_CHUNK_SIZE):
+            chunk = np.arange(chunk_start, min(chunk_start + SHORTEST_PATH_CHUNK_SIZE, n_nodes))
+            if not populate_multi_source_distances(chunk):
                 return False
 
         return True
 
+    def distance(self, source: int, target: int) -> float:
+        """ Looks up the shortest path length between two nodes.
+
+        :param source: The node the path starts at.
+        :param target: The node the path ends at.
+        :return: The length of a shortest path between the nodes, infinity if they are not connected.
+        """
+        distance = self.distance_matrix.item(self.node_indices[source], self.node_indices[target])
+        return distance if distance >= 0 else math.inf
+
 
 class UndominatedNeighborhoodEdgeRankStore(Store):
     ranks: dict[tuple[int, int], float]
 
     def _populate(self, graph: Graph, finish_time: float, *args, **kwargs) -> bool:
         self.ranks = {}
-        neighborhoods = {}
+        nodes, _, adjacency = csr_adjacency(graph)
+        indptr = adjacency.indptr.tolist()
+        indices = adjacency.indices.tolist()
+
+        # closed neighborhoods as lists of node indices read off the CSR adjacency and as bitsets where bit i is set for
+        # the node with index i, so that intersections and unions are single operations on (arbitrarily large) integers
+        neighborhood_members = [[] for _ in nodes]
+        neighborhoods = [0] * len(nodes)
 
         @timeout_loop(finish_time)
         def populate_neighborhoods(vertex: int):
-            neighborhoods[vertex] = {vertex}.union(graph.neighbors(vertex))
+            members = [vertex]
+            members.extend(neighbor for neighbor in indices[indptr[vertex]:indptr[vertex + 1]] if neighbor != vertex)
+            neighborhood_members[vertex] = members
+
+            for member in members:
+                neighborhoods[vertex] |= 1 << member
 
         @timeout_loop(finish_time)
         def populate_rank(vertex: int):
-            neighborhood = neighborhoods[vertex]
+            members = neighborhood_members[vertex]
+
+            # suffix_unions[i] is the union of the neighborhoods of members[i:], so the union of all neighborhoods
+            # except the one of members[i] is the running prefix union together with suffix_unions[i + 1]
+            suffix_unions = [0] * (len(members) + 1)
+            for i in range(len(members) - 1, -1, -1):
+                suffix_unions[i] = suffix_unions[i + 1] | neighborhoods[members[i]]
 
-            for neighbor in neighborhood:
-                hop_neighborhood = set().union(*[
-                    neighborhoods[other_neighbor]
-                    for other_neighbor in neighborhood
-                    if other_neighbor != neighbor
-                ])
+            prefix_union = 0
+            for i, neighbor in enumerate(members):
+                hop_neighborhood = prefix_union | suffix_unions[i + 1]
+                prefix_union |= neighborhoods[neighbor]
 
-                dominated_neighborhood = neighborhoods[neighbor] & hop_neighborhood
-                self.ranks[vertex, neighbor] = self.ranks[neighbor, vertex] = math.exp(-len(dominated_neighborhood))
+                n_dominated = (neighborhoods[neighbor] & hop_neighborhood).bit_count()
+                self.ranks[nodes[vertex], nodes[neighbor]] = self.ranks[nodes[neighbor], nodes[vertex]] = \
+                    math.exp(-n_dominated)
 
-        for node in graph.nodes:
+        for node in range(len(nodes)):
             if not populate_neighborhoods(node):
                 return False
 
-        for node in graph.nodes:
+        for node in range(len(nodes)):
             if not populate_rank(node):
                 return False
 
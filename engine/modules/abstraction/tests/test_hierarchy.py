@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+from unittest import TestCase
+
+from networkx import grid_2d_graph, convert_node_labels_to_integers
+
+from group3.engine.modules.abstraction.hierarchy import AbstractionHierarchy
+
+
+class TestAbstractionHierarchy(TestCase):
+
+    def setUp(self):
+        self.hierarchy = AbstractionHierarchy(convert_node_labels_to_integers(grid_2d_graph(8, 8)))
+        self.abstractions = self.hierarchy.abstractions  # from the lowest to the highest abstraction
+
+    def test_neighboring_abstractions(self):
+        self.assertGreater(len(self.abstractions), 2)
+
+        for i, abstraction in enumerate(self.abstractions):
+            lower = self.abstractions[i - 1] if i > 0 else None
+            higher = self.abstractions[i + 1] if i + 1 < len(self.abstractions) else None
+
+            self.assertIs(lower, self.hierarchy.highest_abstraction_lower_than(abstraction))
+            self.assertIs(higher, self.hierarchy.lowest_abstraction_higher_than(abstraction))
+            self.assertEqual(self.abstractions[i::-1], self.hierarchy.decreasing_abstractions_from(abstraction))
+
+    def test_lowest_and_highest_abstraction(self):
+        self.assertIsNone(self.hierarchy.highest_abstraction_lower_than(self.hierarchy.lowest_abstraction))
+        self.assertIsNone(self.hierarchy.lowest_abstraction_higher_than(self.hierarchy.highest_abstraction))
+        self.assertEqual(self.abstractions[::-1],
+                         self.hierarchy.decreasing_abstractions_from(self.hierarchy.highest_abstraction))
+        self.assertEqual([self.hierarchy.lowest_abstraction],
+                         self.hierarchy.decreasing_abstractions_from(self.hierarchy.lowest_abstraction))
+
+    def test_missing_size(self):
+        # an abstraction whose size lies between the sizes of two abstractions of the hierarchy
+        lower, higher = self.abstractions[0], self.abstractions[1]
+        self.assertGreater(lower.n_nodes - higher.n_nodes, 1)
+        missing = SimpleNamespace(n_nodes=(lower.n_nodes + higher.n_nodes) // 2)
+
+        self.assertIs(lower, self.hierarchy.highest_abstraction_lower_than(missing))
+        self.assertIs(higher, self.hierarchy.lowest_abstraction_higher_than(missing))
+        self.assertEqual([lower], self.hierarchy.decreasing_abstractions_from(missing))
+
+        # sizes beyond the lowest and the highest abstraction
+        self.assertIsNone(self.hierarchy.highest_abstraction_lower_than(SimpleNamespace(n_nodes=lower.n_nodes + 1)))
+        self.assertIs(lower, self.hierarchy.lowest_abstraction_higher_than(SimpleNamespace(n_nodes=lower.n_nodes + 1)))
+        self.assertIsNone(self.hierarchy.lowest_abstraction_higher_than(SimpleNamespace(n_nodes=0)))
+        self.assertIs(self.hierarchy.highest_abstraction,
+                      self.hierarchy.highest_abstraction_lower_than(SimpleNamespace(n_nodes=0)))
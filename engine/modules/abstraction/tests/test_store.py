@@ -0,0 +1,23 @@
+import math
+import time
+from unittest import TestCase
+
+import networkx as nx
+
+from group3.engine.modules.abstraction.store import ShortestPathLengthStore
+
+
+class TestShortestPathLengthStore(TestCase):
+
+    def test_distance(self):
+        # a path and a cycle with labels that differ from the node indices
+        graph = nx.disjoint_union(nx.path_graph(4), nx.cycle_graph(5))
+        graph = nx.relabel_nodes(graph, {node: 2 * node + 1 for node in graph})
+        expected_distances = dict(nx.all_pairs_shortest_path_length(graph))
+
+        store = ShortestPathLengthStore()
+        self.assertTrue(store.populate(graph, time.time() + 10))
+
+        for u in graph:
+            for v in graph:
+                self.assertEqual(expected_distances[u].get(v, math.inf), store.distance(u, v))
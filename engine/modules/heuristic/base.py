@@ -11,7 +11,7 @@ class _BaseHeuristic(ABC, Generic[VertexT]):
 
     def __init__(self, graph: Graph, n_cops: int):
         # assert n_cops >= 1, f"Game can't be played with less than one cops, but number of cops was {n_cops}."
-        self.graph = graph.copy()
+        self.graph = graph  # heuristics only read the graph, so it is shared instead of copied
         self.n_cops = n_cops
 
     @abstractmethod
@@ -1,10 +1,12 @@
 from itertools import chain
 
-from networkx import Graph, astar_path, floyd_warshall
+import numpy as np
+from networkx import Graph, NetworkXNoPath
+from scipy.sparse.csgraph import shortest_path
 
 from .base import CopsHeuristic
-from .util import CopPositions, RobberPosition, compute_effective_game_graph, calc_graph_size
-from ..minimax import CNRMinimaxEngine
+from .util import CopPositions, RobberPosition, VertexT, compute_effective_game_mask, calc_masked_graph_size
+from ..util import csr_adjacency
 
 
 class DisjointPathsCopsHeuristic(CopsHeuristic):
@@ -13,29 +15,65 @@ class DisjointPathsCopsHeuristic(CopsHeuristic):
 
     def __init__(self, graph: Graph, n_cops: int):
         super(DisjointPathsCopsHeuristic, self).__init__(graph, n_cops)
+
+        # the engine is only imported here, so that the other heuristics of the package can be used without it
+        from ..minimax import CNRMinimaxEngine
         self.minimax = CNRMinimaxEngine.factory_default(graph, n_cops)
 
+        # pairwise distances and neighbors addressed by node indices
+        self.nodes, self.node_indices, self.adjacency = csr_adjacency(graph)
+        self.distances = shortest_path(self.adjacency, directed=False, unweighted=True)
+        self.neighbors = [self.adjacency.indices[start:end].tolist()
+                          for start, end in zip(self.adjacency.indptr[:-1], self.adjacency.indptr[1:])]
+
+        # sizes of the effective game graphs computed so far, keyed by the sorted cop positions and the robber position,
+        # as the effective game graph does not depend on the order of the cops and the same positions recur
+        self.effective_game_graph_sizes: dict[tuple[tuple[VertexT, ...], VertexT], int] = {}
+
     def compute_move(self, cop_positions: CopPositions, robber_position: RobberPosition) -> CopPositions:
-        effective_game_graph = compute_effective_game_graph(self.graph, cop_positions, robber_position)
-        effective_game_graph_size = calc_graph_size(effective_game_graph)
+        who = self.node_indices
+        key = (tuple(sorted(cop_positions)), robber_position)
+        if key not in self.effective_game_graph_sizes:
+            effective_game_mask = compute_effective_game_mask(self.adjacency, [who[cop] for cop in cop_positions],
+                                                              who[robber_position])
+            self.effective_game_graph_sizes[key] = calc_masked_graph_size(self.adjacency, effective_game_mask)
+        effective_game_graph_size = self.effective_game_graph_sizes[key]
 
         if effective_game_graph_size <= self.MAX_BRUTEFORCE_GRAPH_SIZE:
             return self.minimax.best_cops_move(cop_positions, robber_position)
 
-        who = {node: i for i, node in enumerate(self.graph.nodes)}
-        distances = floyd_warshall(self.graph)
+        penalties = np.ones(len(self.nodes))  # penalty for every node index of lying on or next to a previous path
         move = []
 
         for cop_position in cop_positions:
-            path = astar_path(self.graph, cop_position, robber_position, heuristic=lambda u, v: distances[u][v])
+            path = self.__shortest_path(who[cop_position], who[robber_position], penalties)
             assert len(path) >= 2, f"Path must have at least length 2. Otherwise the robber is already caught."
-            move.append(path[1])
+            move.append(self.nodes[path[1]])
 
-            path_neighbors = chain(*[list(self.graph.neighbors(node)) for node in path])
-            path_neighbor_indices = [who[neighbor] for neighbor in path_neighbors]
-            path_indices = [who[node] for node in path]
-
-            distances[path_neighbor_indices] *= self.INTERSECTING_PATH_PENALTY
-            distances[path_indices] *= self.INTERSECTING_PATH_PENALTY ** 2
+            path_neighbor_indices = list(chain.from_iterable(map(self.neighbors.__getitem__, path)))
+            penalties[path_neighbor_indices] *= self.INTERSECTING_PATH_PENALTY
+            penalties[path] *= self.INTERSECTING_PATH_PENALTY ** 2
 
         return move
+
+    def __shortest_path(self, source: int, target: int, penalties: np.ndarray) -> list[int]:
+        """ Computes a shortest path between two nodes that avoids penalized nodes where possible.
+
+        As all distances are known, the path follows the gradient of the distances towards the target, i.e., each step
+        goes to a neighbor that is one step closer to the target. Among those, we choose the least penalized one.
+
+        :param source: The index of the node the path starts at.
+        :param target: The index of the node the path ends at.
+        :param penalties: The penalty of every node index.
+        :return: The indices of the nodes on the path from the source to the target.
+        """
+        distances = self.distances[:, target]
+        if np.isinf(distances[source]):
+            raise NetworkXNoPath(f"Node {self.nodes[target]} not reachable from {self.nodes[source]}")
+
+        path = [source]
+        while (node := path[-1]) != target:
+            closer_neighbors = [neighbor for neighbor in self.neighbors[node] if distances[neighbor] < distances[node]]
+            path.append(min(closer_neighbors, key=penalties.__getitem__))
+
+        return path
@@ -1,28 +1,30 @@
-from collections import defaultdict
-
-from networkx import single_source_shortest_path_length
+import numpy as np
+from scipy.sparse.csgraph import shortest_path
 
 from .base import CopsInitializationHeuristic
 from .util import CopPositions
+from ..util import csr_adjacency
 
 
 class DegreeDistributedCopsInitHeuristic(CopsInitializationHeuristic):
     def compute_move(self) -> CopPositions:
-        nodes = set(self.graph.nodes)
-        max_degree_node = max(nodes, key=self.graph.degree.__getitem__)  # node with the highest degree
+        nodes, _, adjacency = csr_adjacency(self.graph)
+        degrees = np.fromiter((degree for _, degree in self.graph.degree), dtype=np.int64, count=len(nodes))
+        max_degree_index = int(degrees.argmax())  # index of the node with the highest degree
 
         # compute distances of all nodes to the node with the highest degree
-        big_sentinel_distance = self.graph.number_of_nodes() + 1
-        shortest_distances = defaultdict(
-            lambda: big_sentinel_distance,
-            single_source_shortest_path_length(self.graph, max_degree_node)
-        )
+        big_sentinel_distance = len(nodes) + 1
+        shortest_distances = shortest_path(adjacency, directed=False, unweighted=True, indices=max_degree_index)
+        shortest_distances[np.isinf(shortest_distances)] = big_sentinel_distance
 
         # sort all other nodes by the product of their degree with their distance to the highest degree node
         n_remaining_cops = self.n_cops - 1
-        degree_distributed_nodes = list(nodes - {max_degree_node})
-        degree_distributed_nodes.sort(key=lambda node: self.graph.degree[node] * shortest_distances[node])
+        degree_distributedness = degrees * shortest_distances
+        degree_distributed_indices = np.argsort(degree_distributedness, kind="stable")
+        degree_distributed_indices = degree_distributed_indices[degree_distributed_indices != max_degree_index]
 
         # place the cops at the node with the highest degree and at the nodes with the biggest degree-distributedness
         # factors
-        return [max_degree_node] + degree_distributed_nodes[-n_remaining_cops:]
+        # if there are more cops than nodes, every node gets a cop
+        remaining_indices = degree_distributed_indices[max(0, len(degree_distributed_indices) - n_remaining_cops):]
+        return [nodes[max_degree_index]] + [nodes[i] for i in remaining_indices]
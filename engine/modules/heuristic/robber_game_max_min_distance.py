@@ -1,37 +1,61 @@
-from networkx import Graph, all_pairs_shortest_path_length
+import numpy as np
+from networkx import Graph
+from scipy.sparse.csgraph import shortest_path
 
 from .base import RobberHeuristic
-from .util import CopPositions, RobberPosition, compute_effective_game_graph, calc_graph_size, VertexT
-from ..minimax import CNRMinimaxEngine
+from .util import CopPositions, RobberPosition, VertexT, compute_effective_game_adjacency
+from ..util import csr_adjacency
 
 
 class MaxMinDistanceRobberHeuristic(RobberHeuristic):
     MAX_BRUTEFORCE_GRAPH_SIZE = 30
+    MAX_CACHED_MOVES = 2 ** 16
 
     def __init__(self, graph: Graph, n_cops: int):
         super(MaxMinDistanceRobberHeuristic, self).__init__(graph, n_cops)
+
+        # the engine is only imported here, so that the other heuristics of the package can be used without it
+        from ..minimax import CNRMinimaxEngine
         self.minimax = CNRMinimaxEngine.factory_default(graph, n_cops)
+        self.nodes, self.node_indices, self.adjacency = csr_adjacency(graph)
+
+        # moves computed so far by the (cop order invariant) max-min distance rule, keyed by the sorted cop positions
+        # and the robber position, as the same positions recur across turns and games on the same graph
+        # once the cache is full, the oldest move is dropped, as it most likely stems from a previous game
+        self.moves: dict[tuple[tuple[VertexT, ...], VertexT], RobberPosition] = {}
 
     def compute_move(self, cop_positions: CopPositions, robber_position: RobberPosition) -> RobberPosition:
-        effective_game_graph = compute_effective_game_graph(self.graph, cop_positions, robber_position)
-        effective_game_graph_size = calc_graph_size(effective_game_graph)
+        key = (tuple(sorted(cop_positions)), robber_position)
+        if key in self.moves:
+            return self.moves[key]
+
+        cop_indices = [self.node_indices[cop_position] for cop_position in cop_positions]
+        robber_index = self.node_indices[robber_position]
+        effective_game_adjacency, effective_game_graph_size = compute_effective_game_adjacency(
+            self.adjacency, cop_indices, robber_index
+        )
 
         if effective_game_graph_size <= self.MAX_BRUTEFORCE_GRAPH_SIZE:
             return self.minimax.best_robber_move(cop_positions, robber_position)
 
-        possible_next_positions = {robber_position}.union(effective_game_graph.neighbors(robber_position))
-        cop_distances = dict(all_pairs_shortest_path_length(effective_game_graph))
+        robber_neighbors = effective_game_adjacency.indices[
+            effective_game_adjacency.indptr[robber_index]:effective_game_adjacency.indptr[robber_index + 1]
+        ]
+        possible_next_positions = np.concatenate(([robber_index], robber_neighbors))
 
-        def compute_min_cop_distance(position: VertexT) -> int:
-            return min(cop_distances[cop_position][position] for cop_position in cop_positions)
+        # distances from every cop (rows) to every node (columns) of the effective game graph
+        cop_distances = shortest_path(effective_game_adjacency, directed=False, unweighted=True, indices=cop_indices)
+        min_cop_distances = cop_distances.min(axis=0)
 
-        almost_caught = int(compute_min_cop_distance(robber_position) == 1)
-        possible_next_positions = filter(
-            lambda position: compute_min_cop_distance(position) > 1 - almost_caught,
-            possible_next_positions
-        )
+        almost_caught = int(min_cop_distances[robber_index] == 1)
+        not_caught = min_cop_distances[possible_next_positions] > 1 - almost_caught
+        possible_next_positions = possible_next_positions[not_caught]
 
-        return max(
-            possible_next_positions,
-            key=lambda position: sum(cop_distances[cop_position][position] for cop_position in cop_positions)
-        )
+        if len(possible_next_positions) == 0:
+            raise ValueError("There is no possible next position for the robber.")
+
+        best_position = possible_next_positions[cop_distances[:, possible_next_positions].sum(axis=0).argmax()]
+        if len(self.moves) >= self.MAX_CACHED_MOVES:
+            del self.moves[next(iter(self.moves))]
+        self.moves[key] = self.nodes[best_position]
+        return self.moves[key]
@@ -1,25 +1,42 @@
 import sys
 
-from networkx import connected_components, Graph, multi_source_dijkstra_path_length
+import numpy as np
+from networkx import Graph
+from scipy.sparse.csgraph import connected_components, dijkstra
 
 from .base import RobberInitializationHeuristic
-from .util import CopPositions, RobberPosition, compute_cop_uncontrolled_subgraph
+from .util import CopPositions, RobberPosition, compute_cop_uncontrolled_mask
+from ..util import csr_adjacency, masked_adjacency
 
 
 class MaxMinDistanceRobberInitHeuristic(RobberInitializationHeuristic):
+    def __init__(self, graph: Graph, n_cops: int):
+        super(MaxMinDistanceRobberInitHeuristic, self).__init__(graph, n_cops)
+        self.nodes, self.node_indices, self.adjacency = csr_adjacency(graph)
+
     def compute_move(self, cop_positions: CopPositions) -> RobberPosition:
         if len(cop_positions) == 0:
             return list(self.graph)[0]
 
-        cop_uncontrolled_subgraph: Graph = compute_cop_uncontrolled_subgraph(self.graph, cop_positions)
-        cop_uncontrolled_components: list[set] = list(connected_components(cop_uncontrolled_subgraph))
-        biggest_robber_controlled_component: set = max(cop_uncontrolled_components, key=len)
-        robber_subgraph: Graph = self.graph.subgraph(biggest_robber_controlled_component | set(cop_positions))
-        distances = multi_source_dijkstra_path_length(robber_subgraph, cop_positions)
-        # TODO Rethink strategy doesn't work in some small examples we found, also multi_source_dijkstra_path_length
-        # TODO ignores nodes that aren't connected to any cop_positions in the subgraph, leading to errors
+        cop_indices = [self.node_indices[cop_position] for cop_position in cop_positions]
+        cop_uncontrolled_mask = compute_cop_uncontrolled_mask(self.adjacency, cop_indices)
+        if cop_uncontrolled_mask.any():
+            _, component_labels = connected_components(masked_adjacency(self.adjacency, cop_uncontrolled_mask),
+                                                       directed=False)
+            component_sizes = np.bincount(component_labels[cop_uncontrolled_mask], minlength=len(self.nodes))
+            biggest_robber_controlled_component = component_sizes.argmax()
+            robber_mask = cop_uncontrolled_mask & (component_labels == biggest_robber_controlled_component)
+            robber_mask[cop_indices] = True
+        else:
+            # every node is controlled by the cops, so the robber is caught anyway and only avoids starting on a cop
+            robber_mask = np.ones(len(self.nodes), dtype=bool)
+
+        # distances of all nodes to their closest cop in a single multi-source search
+        distances = dijkstra(masked_adjacency(self.adjacency, robber_mask), directed=False, unweighted=True,
+                             indices=cop_indices, min_only=True)
+        # TODO Rethink strategy doesn't work in some small examples we found, also nodes that aren't connected to any
+        # TODO cop_positions in the subgraph have no distance, leading to errors
         # hacked solution that doesn't solve anything except return a valid position in the graph
-        for node in robber_subgraph.nodes:
-            if node not in distances:
-                distances[node] = int(sys.maxsize)
-        return max(distances, key=distances.get)
+        distances[np.isinf(distances)] = sys.maxsize
+        distances[~robber_mask] = -1
+        return self.nodes[int(distances.argmax())]
@@ -15,3 +15,11 @@ class TestDegreeDistributedCopsInitHeuristic(TestCase):
         cops_init_pos = heuristic.compute_move()
 
         self.assertCountEqual([3, 6], cops_init_pos)
+
+    def test_compute_move_more_cops_than_nodes(self):
+        graph = nx.Graph(EDGELIST)
+        cops_count = 10
+        heuristic = DegreeDistributedCopsInitHeuristic(graph, cops_count)
+        cops_init_pos = heuristic.compute_move()
+
+        self.assertCountEqual(graph.nodes, cops_init_pos)
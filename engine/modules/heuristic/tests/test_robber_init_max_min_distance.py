@@ -23,3 +23,11 @@ class Test(TestCase):
         # TODO Re-imagination of heuristic (returns wrong position)
         # Doesn't return smart position right now but at least one that's in the graph.
         self.assertEqual(5, move)
+
+    def test_max_min_distance_robber_init_heuristic_all_controlled(self):
+        # the cop controls every node, so the robber starts on the first node that is not occupied by the cop
+        graph = nx.star_graph(4)
+        heuristic = MaxMinDistanceRobberInitHeuristic(graph, 1)
+
+        self.assertEqual(1, heuristic.compute_move([0]))
+        self.assertEqual(0, heuristic.compute_move([1, 2, 3, 4]))
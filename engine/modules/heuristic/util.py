@@ -1,6 +1,11 @@
 from typing import Hashable, TypeVar
 
-from networkx import Graph, node_connected_component
+import numpy as np
+from networkx import Graph
+from scipy.sparse import csr_array
+from scipy.sparse.csgraph import breadth_first_order
+
+from ..util import csr_adjacency, masked_adjacency
 
 VertexT = TypeVar("VertexT", bound=Hashable)
 CopPositions = list[VertexT]
@@ -8,26 +13,64 @@ RobberPosition = VertexT
 
 
 def compute_cop_uncontrolled_subgraph(graph: Graph, cop_positions: CopPositions) -> Graph:
-    cop_neighbor_nodes = set()
-    for cop_position in cop_positions:
-        for pos in graph.neighbors(cop_position):
-            cop_neighbor_nodes.add(pos)
-    cop_controlled_nodes = set(cop_positions) | cop_neighbor_nodes
-
-    robber_controlled_nodes = set(graph.nodes) - cop_controlled_nodes
-    return graph.subgraph(robber_controlled_nodes)
+    nodes, node_indices, adjacency = csr_adjacency(graph)
+    cop_uncontrolled = compute_cop_uncontrolled_mask(adjacency, [node_indices[cop] for cop in cop_positions])
+    return graph.subgraph([nodes[i] for i in np.flatnonzero(cop_uncontrolled).tolist()])
 
 
 def compute_effective_game_graph(graph: Graph, cop_positions: CopPositions, robber_position: RobberPosition) -> Graph:
-    cop_uncontrolled_subgraph = compute_cop_uncontrolled_subgraph(graph, cop_positions)
-    # node_connected_component raises errors if robber_position isn't in it
-    if cop_uncontrolled_subgraph.nodes.__contains__(robber_position):
-        robber_connected_nodes = node_connected_component(cop_uncontrolled_subgraph, robber_position)
-    else:
-        # TODO think about this case that seems to happen a lot
-        robber_connected_nodes = set(graph.nodes)
-    return graph.subgraph(robber_connected_nodes | set(cop_positions))
+    nodes, node_indices, adjacency = csr_adjacency(graph)
+    effective_game_mask = compute_effective_game_mask(adjacency, [node_indices[cop] for cop in cop_positions],
+                                                      node_indices[robber_position])
+    return graph.subgraph([nodes[i] for i in np.flatnonzero(effective_game_mask).tolist()])
 
 
 def calc_graph_size(graph: Graph) -> int:
     return graph.number_of_nodes() + graph.number_of_edges()
+
+
+def compute_cop_uncontrolled_mask(adjacency: csr_array, cop_indices: list[int]) -> np.ndarray:
+    cop_uncontrolled = np.ones(adjacency.shape[0], dtype=bool)
+    cop_uncontrolled[cop_indices] = False
+    for cop_index in cop_indices:
+        cop_uncontrolled[adjacency.indices[adjacency.indptr[cop_index]:adjacency.indptr[cop_index + 1]]] = False
+
+    return cop_uncontrolled
+
+
+def compute_effective_game_mask(adjacency: csr_array, cop_indices: list[int], robber_index: int) -> np.ndarray:
+    cop_uncontrolled = compute_cop_uncontrolled_mask(adjacency, cop_indices)
+    if cop_uncontrolled[robber_index]:
+        robber_connected = np.zeros(len(cop_uncontrolled), dtype=bool)
+        robber_connected[breadth_first_order(masked_adjacency(adjacency, cop_uncontrolled), robber_index,
+                                             directed=False, return_predecessors=False)] = True
+    else:
+        # TODO think about this case that seems to happen a lot
+        robber_connected = np.ones(len(cop_uncontrolled), dtype=bool)
+
+    robber_connected[cop_indices] = True
+    return robber_connected
+
+
+def compute_effective_game_adjacency(
+    adjacency: csr_array,
+    cop_indices: list[int],
+    robber_index: int
+) -> tuple[csr_array, int]:
+    effective_game_mask = compute_effective_game_mask(adjacency, cop_indices, robber_index)
+    effective_game_adjacency = masked_adjacency(adjacency, effective_game_mask)
+
+    # the size is read off the masked adjacency instead of another pass over all edges
+    n_entries = len(effective_game_adjacency.indices)
+    n_self_loops = np.count_nonzero(effective_game_adjacency.diagonal())  # self-loops only have one entry
+    size = np.count_nonzero(effective_game_mask) + (n_entries - n_self_loops) // 2 + n_self_loops
+
+    return effective_game_adjacency, int(size)
+
+
+def calc_masked_graph_size(adjacency: csr_array, mask: np.ndarray) -> int:
+    rows = np.repeat(np.arange(adjacency.shape[0]), np.diff(adjacency.indptr))
+    inside = mask[rows] & mask[adjacency.indices]
+    n_self_loops = np.count_nonzero(inside & (rows == adjacency.indices))  # self-loops only have one entry
+
+    return int(np.count_nonzero(mask) + (np.count_nonzero(inside) - n_self_loops) // 2 + n_self_loops)
@@ -1,4 +1,4 @@
-from .abstraction import trap_free_subgraph
+from .abstraction import trap_free_mask, trap_free_subgraph
 from .component import Component
 
-__ALL__ = ("trap_free_subgraph", "Component")
+__ALL__ = ("trap_free_mask", "trap_free_subgraph", "Component")
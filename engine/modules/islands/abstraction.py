@@ -1,24 +1,63 @@
+from collections import deque
+
+import numpy as np
 from networkx import Graph
+from scipy.sparse import csr_array
+
+from ..util import csr_adjacency
 
 
 def trap_free_subgraph(graph: Graph) -> Graph:
     """ Computes a subgraph that only contains the regions of the input graph where the robber is not trapped.
 
+    See 'trap_free_mask' for how the trap nodes are found. The resulting subgraph might not be connected. If the graph
+    only contains trap nodes (e.g., path graphs, trees) the resulting subgraph is empty.
+
+    :param graph: The graph to compute the trap free subgraph for.
+    :return: The trap free subgraph.
+    """
+    trap_free = trap_free_mask(graph)
+    return graph.subgraph(node for node, is_trap_free in zip(graph.nodes, trap_free) if is_trap_free)
+
+
+def trap_free_mask(graph: Graph, adjacency: csr_array | None = None) -> np.ndarray:
+    """ Computes the nodes of the regions of the input graph where the robber is not trapped.
+
     We start with the whole graphs. We iteratively remove nodes with degree 0 or 1. This is because the robber cannot
     escape from a nodes with degree 0 or 1 and will sooner or later be unable to escape from any node that was adjacent
     only to other trap nodes in previous iterations.
 
-    The resulting subgraph might not be connected. If the graph only contains trap nodes (e.g., path graphs, trees) the
-    resulting subgraph is empty.
+    Instead of rescanning all degrees after each round of removals, we keep the degrees of the remaining nodes up to
+    date and maintain a queue of nodes whose degree dropped below 2. This way every node and edge is handled only once.
 
-    :param graph: The graph to compute the trap free subgraph for.
-    :return: The trap free subgraph.
+    Callers that only need to traverse or count the trap free region can use the mask with the adjacency matrix of the
+    graph instead of materializing a subgraph.
+
+    :param graph: The graph to compute the trap free nodes for.
+    :param adjacency: The adjacency matrix of the graph as computed by 'csr_adjacency', if already at hand.
+    :return: A flag for every node index (in the order of the graph) whether the node is trap free.
     """
-    stop = False  # we stop as soon as we do not remove any nodes anymore
+    if adjacency is None:
+        _, _, adjacency = csr_adjacency(graph)
+    indptr = adjacency.indptr.tolist()
+    indices = adjacency.indices.tolist()
+
+    degrees = [degree for _, degree in graph.degree]  # self-loops count twice as in the degree of the graph
+    alive = [True] * len(degrees)  # stores whether a node has not been removed yet
+    trap_nodes = deque(node for node, degree in enumerate(degrees) if degree < 2)
+
+    while trap_nodes:
+        node = trap_nodes.popleft()
+        if not alive[node]:
+            continue
+
+        alive[node] = False
 
-    while not stop:
-        nodes = [node for node, degree in graph.degree if degree >= 2]  # filter out nodes with degree 0 or 1
-        stop = len(nodes) == graph.number_of_nodes()  # check if the node set became smaller
-        graph = graph.subgraph(nodes)  # update graph to remove trap nodes
+        # removing the node lowers the degree of its remaining neighbors, which might turn them into trap nodes
+        for neighbor in indices[indptr[node]:indptr[node + 1]]:
+            if alive[neighbor]:
+                degrees[neighbor] -= 1
+                if degrees[neighbor] < 2:
+                    trap_nodes.append(neighbor)
 
-    return graph
+    return np.array(alive, dtype=bool)
@@ -1,38 +1,38 @@
-import math
-from statistics import mean
+import numpy as np
 
-from .abstraction import trap_free_subgraph
+from .abstraction import trap_free_mask
 from .component import Component
+from ..util import csr_adjacency, masked_adjacency
 
 
 def component_cop_distribution(components: list[Component]) -> dict[Component, float]:
-    cop_numbers = {}
-    total_cop_number = 0
-
-    for component in components:
-        trap_free_component = trap_free_subgraph(component.graph)
-
-        if trap_free_component.number_of_nodes() == 0:
-            cop_number = 0
-        else:
-            mean_degree = mean(trap_free_component.degree[node] for node in trap_free_component.nodes)
-            n_nodes = trap_free_component.number_of_nodes()
-            sqrt_nodes = math.sqrt(n_nodes)
-
-            if mean_degree <= sqrt_nodes:
-                cop_number = mean_degree
-            else:
-                cop_number = sqrt_nodes * (1 - (mean_degree - sqrt_nodes) / (n_nodes - sqrt_nodes))
-
-        cop_numbers[component] = cop_number
-        total_cop_number += cop_number
+    n_nodes = np.zeros(len(components))
+    degree_sums = np.zeros(len(components))
+
+    # sizes of the trap free regions of all components, counted on the masked adjacency without building subgraphs
+    for i, component in enumerate(components):
+        _, _, adjacency = csr_adjacency(component.graph)
+        trap_free = trap_free_mask(component.graph, adjacency)
+        trap_free_adjacency = masked_adjacency(adjacency, trap_free)
+
+        n_nodes[i] = np.count_nonzero(trap_free)
+        # self-loops only have one entry, but count twice in the degree
+        degree_sums[i] = len(trap_free_adjacency.indices) + np.count_nonzero(trap_free_adjacency.diagonal())
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_degrees = np.where(n_nodes > 0, degree_sums / n_nodes, 0)
+        sqrt_nodes = np.sqrt(n_nodes)
+        cop_numbers = np.where(
+            mean_degrees <= sqrt_nodes,
+            mean_degrees,
+            sqrt_nodes * (1 - (mean_degrees - sqrt_nodes) / (n_nodes - sqrt_nodes))
+        )
+
+    total_cop_number = cop_numbers.sum()
 
     if total_cop_number == 0:
         n_nodes = sum(component.graph.number_of_nodes() for component in components)
         assert n_nodes > 0
         return {component: component.graph.number_of_nodes() / n_nodes for component in components}
 
-    return {
-        component: cop_number / total_cop_number
-        for component, cop_number in cop_numbers.items()
-    }
+    return dict(zip(components, (cop_numbers / total_cop_number).tolist()))
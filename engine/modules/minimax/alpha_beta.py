@@ -1,16 +1,36 @@
 import time
-from typing import Callable, Iterable
-
-from .zobrist import Move, ZobristTranspositionTable
+from typing import Callable, Iterable, Iterator
 
+from .zobrist import Move, TranspositionItem, ZobristTranspositionTable
 
 def is_terminal(cop_positions: list[int], robber_position: int) -> bool:
     return robber_position in cop_positions
 
 
+class _SearchFrame:
+    """ A state of the search tree whose successor states are being evaluated. """
+
+    __slots__ = (
+        "state", "hash_key", "alpha", "beta", "successors", "successor", "best_move", "evaluation", "is_cut_off"
+    )
+
+    def __init__(self, state: TranspositionItem, hash_key: int, alpha: float, beta: float, successors: Iterator[Move]):
+        cop_positions, robber_position, cop_turn, _ = state
+
+        self.state = state  # cop positions, robber position, whether it is the cops' turn, and remaining depth
+        self.hash_key = hash_key  # key of the state in the transposition table
+        self.alpha = alpha
+        self.beta = beta
+        self.successors = successors  # successor moves that have not been evaluated yet
+        self.successor = None  # the successor move currently being evaluated
+        self.best_move = cop_positions if cop_turn else robber_position  # by default, stay in the current position
+        self.evaluation = alpha if cop_turn else beta  # by default, choose the most pessimistic state value
+        self.is_cut_off = False  # whether the remaining successors can be skipped
+
+
 def minimax_alpha_beta(
     transposition: ZobristTranspositionTable,
-    cop_transitions: Callable[[list[int], int], Iterable[list[int]]],
+    cop_transitions: Callable[[list[int], int], Iterable[tuple[int, ...]]],
     robber_transitions: Callable[[list[int], int], Iterable[int]],
     cop_positions: list[int],
     robber_position: int,
@@ -18,10 +38,14 @@ def minimax_alpha_beta(
     remaining_depth: int,
     finish_time: float,
     alpha: float = 0,
-    beta: float = 1
+    beta: float = 1,
+    evaluator: Callable[[list[int], int], float] | None = None
 ) -> tuple[Move, float]:
     """ Performs minimax with alpha beta pruning from a given start configuration and up to a given depth.
 
+    Instead of recursing into successor states, we keep the states whose successors are being evaluated on an explicit
+    stack. This saves the overhead of a Python function call per visited state.
+
     :param transposition: Transposition table to use for lookups.
     :param cop_transitions: Function computing possible next positions for the cops.
     :param robber_transitions: Function computing possible next positions for the robber.
@@ -32,81 +56,118 @@ def minimax_alpha_beta(
     :param finish_time: Time stamp indicating when the solution must have been returned at the latest.
     :param alpha: Lower bound on the evaluation achievable from the start configuration.
     :param beta: Upper bound on the evaluation achievable from the start configuration.
+    :param evaluator: Optional function statically estimating how favorable a configuration is for the cops. If given,
+    successor states are searched in order of their estimate (most favorable for the party to move first), which lets
+    alpha beta pruning cut off more subtrees.
     :return: The best move in the given configuration and a Boolean indicating if the move leads to a cop win for
     optimal play of both parties up to the given depth.
     """
-    key = cop_positions, robber_position, cop_turn, remaining_depth
-
-    if key not in transposition:  # only evaluate the state if it is not cached
-        best_move = cop_positions if cop_turn else robber_position  # by default, stay in the current position
-        evaluation = alpha if cop_turn else beta  # by default, choose the most pessimistic state value
-
-        # case 1: the current state is a leaf node in the search tree
-        # then, we do not move and just update the value of the state
-        # the value is 1 if it is cop win and 0 otherwise
-        if (is_terminal_state := is_terminal(cop_positions, robber_position)) or remaining_depth <= 0:
-            evaluation = int(is_terminal_state)
-        # case 2: the current state is not a leaf node, but we are running out of time
-        # then, we simply return the current position and an evaluation inbetween cop win and robber win
-        elif finish_time - time.time() <= 0.001 / (remaining_depth + 1):
-            return best_move, 0.5
-        # case 3: the current state is not a leaf node, and we have computation time left, and it is a cop turn
-        # then, we dynamically compute the value and the best move for the cops based on successor states
-        elif cop_turn:
-            for successor_positions in cop_transitions(cop_positions, robber_position):
-                _, successor_evaluation = minimax_alpha_beta(
-                    transposition,
-                    cop_transitions,
-                    robber_transitions,
-                    successor_positions,
-                    robber_position,
-                    False,
-                    remaining_depth - 1,
-                    finish_time,
-                    alpha,
-                    beta
-                )
-
-                # always choose the successor state with the highest value
-                if successor_evaluation > evaluation:
-                    evaluation = successor_evaluation
-                    best_move = successor_positions
-
-                alpha = max(alpha, evaluation)  # update lower bound
+    stack: list[_SearchFrame] = []
+    # the next state to evaluate and its hash key if it can be derived from the state it is reached from
+    state = cop_positions, robber_position, cop_turn, remaining_depth, alpha, beta, None
+    result = None  # move and evaluation of the most recently evaluated state
+
+    # time margins by remaining depth that must be left to expand a state
+    # the remaining depth never increases below the start configuration, so these margins suffice for the whole search
+    time_margins = [0.001 / (depth + 1) for depth in range(max(remaining_depth, 0) + 1)]
+
+    while True:
+        if state is not None:
+            cop_positions, robber_position, cop_turn, remaining_depth, alpha, beta, hash_key = state
+            state = None
+
+            # the hash key is computed only once per state and used for all accesses to the transposition table
+            if hash_key is None:
+                hash_key = transposition.key(cop_positions, robber_position, cop_turn)
+
+            # case 0: the state is cached, so we do not evaluate it again
+            if (cached := transposition.lookup(hash_key, remaining_depth)) is not None:
+                result = cached
+            # case 1: the current state is a leaf node in the search tree
+            # then, we do not move and just update the value of the state
+            # the value is 1 if it is cop win and 0 otherwise
+            elif (is_terminal_state := is_terminal(cop_positions, robber_position)) or remaining_depth <= 0:
+                result = transposition.store(hash_key, remaining_depth, cop_positions if cop_turn else robber_position,
+                                             int(is_terminal_state))
+            # case 2: the current state is not a leaf node, but we are running out of time
+            # then, we simply return the current position and an evaluation inbetween cop win and robber win
+            # the clock is read for every expanded state, as a single expansion may generate many successors
+            elif finish_time - time.time() <= time_margins[remaining_depth]:
+                result = cop_positions if cop_turn else robber_position, 0.5
+            # case 3: the current state is not a leaf node, and we have computation time left
+            # then, we dynamically compute the value and the best move based on the successor states
+            else:
+                if cop_turn:
+                    successors = cop_transitions(cop_positions, robber_position)
+                    if evaluator is not None:
+                        successors = sorted(successors, key=lambda move: evaluator(move, robber_position), reverse=True)
+                else:
+                    successors = robber_transitions(cop_positions, robber_position)
+                    if evaluator is not None:
+                        successors = sorted(successors, key=lambda move: evaluator(cop_positions, move))
+
+                # try the best move of a shallower search of this state first as it is likely still the best one
+                # the move is only used if it is a successor as the table does not distinguish the order of cops
+                if (hint := transposition.hint(hash_key)) is not None:
+                    hint = tuple(hint) if cop_turn else hint
+                    # lazily generated successors are only materialized here, sorted ones already are a list
+                    if not isinstance(successors, list):
+                        successors = list(successors)
+                    if hint in successors:
+                        successors.remove(hint)
+                        successors.insert(0, hint)
+
+                stack.append(_SearchFrame((cop_positions, robber_position, cop_turn, remaining_depth), hash_key,
+                                          alpha, beta, iter(successors)))
+
+        if result is not None:
+            if not stack:
+                return result
+
+            # pass the evaluation of the state on to the state it was reached from
+            frame = stack[-1]
+            _, successor_evaluation = result
+            result = None
+
+            # case 3a: it is a cop turn, so we choose the successor state with the highest value
+            _, _, frame_cop_turn, _ = frame.state
+            if frame_cop_turn:
+                if successor_evaluation > frame.evaluation:
+                    frame.evaluation = successor_evaluation
+                    frame.best_move = frame.successor
+
+                frame.alpha = max(frame.alpha, frame.evaluation)  # update lower bound
 
                 # stop evaluating this subtree if the value of this state exceeds the upper bound
                 # we can do this because the robber has a strategy that always results in a lower value in this case
-                if evaluation >= beta:
-                    break
-        # case 4: the current state is not a leaf node, and we have computation time left, and it is a robber turn
-        # then, we dynamically compute the value and the best move for the robber based on successor states
-        else:
-            for successor_position in robber_transitions(cop_positions, robber_position):
-                _, successor_evaluation = minimax_alpha_beta(
-                    transposition,
-                    cop_transitions,
-                    robber_transitions,
-                    cop_positions,
-                    successor_position,
-                    True,
-                    remaining_depth,
-                    finish_time,
-                    alpha,
-                    beta
-                )
-
-                # always choose the successor state with the highest value
-                if successor_evaluation < evaluation:
-                    evaluation = successor_evaluation
-                    best_move = successor_position
-
-                beta = min(beta, evaluation)  # update higher bound
+                frame.is_cut_off = frame.evaluation >= frame.beta
+            # case 3b: it is a robber turn, so we choose the successor state with the lowest value
+            else:
+                if successor_evaluation < frame.evaluation:
+                    frame.evaluation = successor_evaluation
+                    frame.best_move = frame.successor
+
+                frame.beta = min(frame.beta, frame.evaluation)  # update higher bound
 
                 # stop evaluating this subtree if the value of this state exceeds the lower bound
                 # we can do this because the cops have a strategy that always results in a higher value in this case
-                if evaluation <= alpha:
-                    break
-
-        transposition[key] = best_move, evaluation  # save the evaluation in the transposition table
-
-    return transposition[key]
+                frame.is_cut_off = frame.evaluation <= frame.alpha
+
+        # continue with the next successor of the innermost state under evaluation or finish that state
+        frame = stack[-1]
+        frame_cop_positions, frame_robber_position, frame_cop_turn, frame_remaining_depth = frame.state
+
+        if not frame.is_cut_off and (successor := next(frame.successors, None)) is not None:
+            frame.successor = successor
+
+            if frame_cop_turn:
+                depth = frame_remaining_depth - 1
+                state = successor, frame_robber_position, False, depth, frame.alpha, frame.beta, None
+            else:
+                # only the robber moves, so the hash key is updated incrementally
+                hash_key = transposition.robber_move_key(frame.hash_key, frame_robber_position, successor)
+                state = frame_cop_positions, successor, True, frame_remaining_depth, frame.alpha, frame.beta, hash_key
+        else:
+            stack.pop()
+            # save the evaluation in the transposition table
+            result = transposition.store(frame.hash_key, frame_remaining_depth, frame.best_move, frame.evaluation)
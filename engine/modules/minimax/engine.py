@@ -1,57 +1,67 @@
 from typing import Callable, Iterator
 
+import numpy as np
 from networkx import Graph
+from scipy.sparse import csr_array
 
 from .iterative_deepening import iterative_deepening_minimax
 from .zobrist import ZobristTranspositionTable
-from ..util import timeout_loop
+from ..abstraction import ShortestPathLengthStore
+from ..util import csr_adjacency, timeout_loop
 
 
 def effective_game_graph(
     graph: Graph,
     cop_positions: list[int],
     robber_position: int,
-    max_radius: float
+    max_radius: float,
+    adjacency: tuple[list[int], dict[int, int], csr_array] | None = None
 ) -> Iterator[tuple[Graph, set[int]]]:
     """ Generates a sequence of contour sub graphs around the robber with an increasing number of cops in it.
 
-    We perform a BFS starting from the cop position. Every time we reach a new robber, we yield the sub graph covered
+    We perform a BFS starting from the robber position. Every time we reach a new cop, we yield the sub graph covered
     by the BFS so far together with the set of cop indices that are not part of this subgraph yet.
 
     After a given radius, we stop expanding the contours. This feature can be used to stop expanding early as for a
     fixed search depth, there is no point in expanding the search graph further than the depth of the search.
 
+    The BFS expands whole contours at once on the CSR adjacency of the graph with boolean masks for the visited nodes.
+
     :param graph: The graph on which the cops play against the robber.
     :param cop_positions: The current cop positions in the graph.
     :param robber_position: The current robber position in the graph.
     :param max_radius: Radius around the robber after which to stop drawing contours.
+    :param adjacency: The nodes, the mapping from nodes to their indices, and the adjacency matrix of the graph as
+    computed by 'csr_adjacency', if already at hand.
     :yields: A sequence of sub graphs of the given graph and a set of cop indices that are not inside this sub graph.
     """
-    n_cops = len(cop_positions)  # number of cops
+    nodes, node_indices, adjacency = csr_adjacency(graph) if adjacency is None else adjacency
+    cop_indices = np.array([node_indices[cop_position] for cop_position in cop_positions], dtype=np.int64)
+    robber_index = node_indices[robber_position]
 
-    contour = {robber_position}  # start BFS from the robber node
-    hidden_cops = set(range(n_cops)) - contour  # set of cop indices not yet reached by the BFS
-    visited_nodes = set()
+    contour = np.array([robber_index])  # start BFS from the robber node
+    hidden_cops = cop_indices != robber_index  # flags for the cops not yet reached by the BFS
+    visited_nodes = np.zeros(len(nodes), dtype=bool)
     radius = 0
 
     # performs a BFS through the whole graph
-    while contour:
+    while len(contour):
         if radius > max_radius:
             break
-        visited_nodes.update(contour)  # the current contour was now visited
+        visited_nodes[contour] = True  # the current contour was now visited
 
         # the next contour consist of the unvisited neighbors of the last contour
-        next_contour = {
-            neighbor for node in contour
-            for neighbor in graph.neighbors(node)
-            if neighbor not in visited_nodes
-        }
+        next_contour = np.unique(adjacency[contour].indices)
+        next_contour = next_contour[~visited_nodes[next_contour]]
+        in_next_contour = np.zeros(len(nodes), dtype=bool)
+        in_next_contour[next_contour] = True
 
-        newly_found_cops = hidden_cops & next_contour  # set of cops reached in the last contour
+        newly_found_cops = hidden_cops & in_next_contour[cop_indices]  # cops reached in the last contour
 
-        if newly_found_cops:
-            hidden_cops.difference_update(newly_found_cops)
-            yield graph.subgraph(visited_nodes | next_contour), hidden_cops
+        if newly_found_cops.any():
+            hidden_cops &= ~newly_found_cops
+            covered_nodes = [nodes[i] for i in np.flatnonzero(visited_nodes | in_next_contour).tolist()]
+            yield graph.subgraph(covered_nodes), set(np.flatnonzero(hidden_cops).tolist())
 
         contour = next_contour
         radius += 1
@@ -59,12 +69,34 @@ def effective_game_graph(
 
 class MinimaxEngine:
     graph: Graph
+    adjacency: tuple[list[int], dict[int, int], csr_array]
     transposition: ZobristTranspositionTable
+    shortest_path_lengths: ShortestPathLengthStore | None
+    cop_transitions: dict[int, tuple[int, ...]]
+    winning_moves: dict[tuple[tuple[int, ...], int, int], list[int]]
     failed: dict[tuple[int, ...], bool]
 
-    def __init__(self, graph: Graph, n_cops: int):
+    def __init__(self, graph: Graph, n_cops: int, shortest_path_lengths: ShortestPathLengthStore | None = None):
         self.graph = graph
+        self.adjacency = csr_adjacency(graph)
         self.transposition = ZobristTranspositionTable(graph, n_cops)
+        self.shortest_path_lengths = shortest_path_lengths  # used to order the search once it is populated
+        # positions reachable by a cop in one step from every node, shared across all searches on the graph
+        self.cop_transitions = {node: (*graph.neighbors(node), node) for node in graph.nodes}
+        # winning moves found so far by cop positions, robber position, and search depth
+        self.winning_moves = {}
+
+    def evaluate(self, cop_positions: list[int], robber_position: int) -> float:
+        """ Statically estimates how favorable a configuration is for the cops.
+
+        The closer the closest cop is to the robber, the more favorable the configuration is for the cops.
+
+        :param cop_positions: The cop positions in the graph.
+        :param robber_position: The robber position in the graph.
+        :return: The negative distance between the robber and the closest cop.
+        """
+        distance = self.shortest_path_lengths.distance
+        return -min(distance(robber_position, cop_position) for cop_position in cop_positions)
 
     def best_cop_move(
         self,
@@ -81,6 +113,10 @@ class MinimaxEngine:
         We share the same transposition table across different calls of this function in order to make use of previously
         computes results.
 
+        Winning moves are memoized, so asking for the same configuration and depth again returns immediately. Moves that
+        are not winning are not memoized because the search might have been cut short by the time limit. Memoized moves
+        assume that the fixated steps only depend on the cop and robber positions.
+
         :param cop_positions: The current cop positions in the graph.
         :param robber_position: The current robber position in the graph.
         :param depth: Depth up which to search the minimax tree.
@@ -88,9 +124,19 @@ class MinimaxEngine:
         :param finish_time: Time stamp indicating when the solution must have been returned at the latest.
         :return: A Boolean indicating whether a cop winning step was found and the according cop move.
         """
+        key = tuple(cop_positions), robber_position, depth
+        if key in self.winning_moves:
+            return self.winning_moves[key].copy(), True
+
         move = cop_positions
         is_winning = False
 
+        # order the search by distance between cops and robber if the distances are known
+        if self.shortest_path_lengths is not None and self.shortest_path_lengths.is_populated:
+            evaluator = self.evaluate
+        else:
+            evaluator = None
+
         @timeout_loop(finish_time, 2)
         def contour_minimax():
             nonlocal move, is_winning
@@ -105,14 +151,19 @@ class MinimaxEngine:
                 finish_time,
                 self.transposition,
                 hidden_cops,
-                fixated_step
+                fixated_step,
+                evaluator,
+                self.cop_transitions
             )
 
-        for graph, hidden_cops in effective_game_graph(self.graph, cop_positions, robber_position, depth):
+        for graph, hidden_cops in effective_game_graph(
+            self.graph, cop_positions, robber_position, depth, self.adjacency
+        ):
             if not contour_minimax():
                 break
 
             if is_winning:
+                self.winning_moves[key] = move.copy()
                 return move, is_winning
 
         return move, is_winning
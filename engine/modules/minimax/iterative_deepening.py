@@ -1,7 +1,9 @@
 from itertools import product
-from typing import Iterable, Callable
+from typing import Iterable, Iterator, Callable
 
-from networkx import Graph, max_weight_matching
+import numpy as np
+from networkx import Graph
+from scipy.optimize import linear_sum_assignment
 
 from .alpha_beta import minimax_alpha_beta
 from .zobrist import Move, ZobristTranspositionTable
@@ -22,47 +24,66 @@ def restore_possible_move_permutation(graph: Graph, cop_positions: list[int], mo
 
     We first check, if the given move is already possible for the given cop positions. If this is the case, we simply
     return the move as is. Otherwise, we construct a permutation of the move that is possible for the given cop
-    positions. We do so by creating a bipartite graph that connects cops with the moves that they could actually make.
-    We then compute a maximum matching. Iff a permutation with the desired properties exists, the maximum matching will
-    be a perfect matching that induces a permutation of the cop moves which makes the move possible for the given cop
-    positions. We then simply apply that permutation to the given cop move.
+    positions. We do so by creating a bipartite biadjacency matrix that connects cops with the moves that they could
+    actually make. We then compute a maximum assignment on it. Iff a permutation with the desired properties exists,
+    the assignment will be a perfect matching that induces a permutation of the cop moves which makes the move possible
+    for the given cop positions. We then simply apply that permutation to the given cop move.
 
     :param graph: The graph on which the cops play against the robber.
     :param cop_positions: The current positions of the cops in the graph.
     :param move: Desired target positions for the cops (possibly only reachable in a different oder of the cops).
     :return: A permutation of the given move which is possible for the given cop positions.
     """
-    # set of nodes that can be reached by each individual cop in one step from the current position
-    possible_next_nodes = [
-        {cop_position}.union(graph.neighbors(cop_position))
-        for cop_position in cop_positions
-    ]
-
-    # check if the move is already possible from the current cop positions
-    if all(target_position in possible_next_nodes[cop_id] for cop_id, target_position in enumerate(move)):
+    adjacency = graph.adj
+
+    # check if the move is already possible from the current cop positions, which is usually the case
+    # a single cop cannot be permuted, so its move is always returned as is
+    if len(move) <= 1 or all(
+        target_position == cop_position or target_position in adjacency[cop_position]
+        for cop_position, target_position in zip(cop_positions, move)
+    ):
         return move
 
-    # construct a graph that matches cops with the moves they could make
-    # we represent cops as negative 1-indexed to disambiguate them from the move indices
-    move_matching_graph = Graph({
-        -(cop_id + 1): [move_id for move_id, move in enumerate(move) if move in possible_next_nodes[cop_id]]
-        for cop_id, cop_position in enumerate(cop_positions)
-    })
-
-    # compute a maximum matching
-    # this should be a perfect matching if the move is possible under some permutation of the cops
-    move_permutation_matching = max_weight_matching(move_matching_graph, maxcardinality=True)
+    # set of nodes that can be reached by each individual cop in one step from the current position
+    # the union with the key view of the adjacency is built in C without iterating the neighbors in Python
+    possible_next_nodes = [adjacency[cop_position].keys() | {cop_position} for cop_position in cop_positions]
+
+    # construct a biadjacency matrix that matches cops (rows) with the moves they could make (columns)
+    move_matching = np.array([
+        [target_position in possible_next_nodes[cop_id] for target_position in move]
+        for cop_id in range(len(cop_positions))
+    ], dtype=np.int8)
+
+    # compute a maximum assignment
+    # this is a perfect matching if the move is possible under some permutation of the cops
+    cop_ids, move_ids = linear_sum_assignment(move_matching, maximize=True)
     move_permutation = [-1] * len(move)
 
     # map the matching to a permutation of the move
-    for matching in move_permutation_matching:
-        cop_id = -min(matching) - 1  # map cop indices from negative 1-indexed to 0-indexed
-        move_id = max(matching)
+    for cop_id, move_id in zip(cop_ids.tolist(), move_ids.tolist()):
         move_permutation[cop_id] = move[move_id]
 
     return move_permutation
 
 
+def distinct_cop_moves(moves: Iterable[tuple[int, ...]]) -> Iterator[tuple[int, ...]]:
+    """ Filters cop moves that are permutations of previous moves.
+
+    As fixated cops only have a single move, two moves that are permutations of each other only differ in the order of
+    the cops that move freely. As the cops are interchangeable, both moves lead to equivalent configurations.
+
+    :param moves: The cop moves to filter.
+    :yields: The cop moves that are no permutation of a previous move in the order of the given moves.
+    """
+    seen = set()
+
+    for move in moves:
+        canonical_move = tuple(sorted(move))
+        if canonical_move not in seen:
+            seen.add(canonical_move)
+            yield move
+
+
 def iterative_deepening_minimax(
     effective_graph: Graph,
     graph: Graph,
@@ -73,7 +94,9 @@ def iterative_deepening_minimax(
     finish_time: float,
     transposition: ZobristTranspositionTable,
     hidden_cops: set[int],
-    fixated_steps: Callable[[list[int], int], list[int]]
+    fixated_steps: Callable[[list[int], int], list[int]],
+    evaluator: Callable[[list[int], int], float] | None = None,
+    cop_transition_cache: dict[int, tuple[int, ...]] | None = None
 ) -> tuple[Move, bool]:
     """ Performs iterative deepening minimax with alpha beta pruning.
 
@@ -93,14 +116,23 @@ def iterative_deepening_minimax(
     :param finish_time: Time stamp indicating when the solution must have been returned at the latest.
     :param transposition: Transposition table storing previously computed results on the same graph.
     :param fixated_steps: Function computing steps for hidden cops.
+    :param evaluator: Optional function estimating how favorable a configuration is for the cops to order the search.
+    :param cop_transition_cache: Optional cache of the positions a cop can reach in one step from a node in the graph,
+    which is filled as needed and can be shared across calls on the same graph.
     :return: A tuple containing the best move to be made in the current configuration and a Boolean indicating whether
     the cops have a winning strategy taking that move.
     """
-    cop_transition_cache = {}
+    if cop_transition_cache is None:
+        cop_transition_cache = {}
+
+    # the effective graph is a filtered view of the graph, so we look up the neighbors of every robber position once
+    robber_transition_cache = {}
 
     def robber_transitions(_, _robber_position: int) -> Iterable[int]:
-        yield _robber_position
-        yield from effective_graph.neighbors(_robber_position)
+        if _robber_position not in robber_transition_cache:
+            robber_transition_cache[_robber_position] = (_robber_position, *effective_graph.neighbors(_robber_position))
+
+        return robber_transition_cache[_robber_position]
 
     fixated_cops = list(hidden_cops)
     fixated_cop_positions = [cop_positions[cop_id] for cop_id in fixated_cops]
@@ -109,17 +141,31 @@ def iterative_deepening_minimax(
         for cop_id, cop_fixated_step in zip(fixated_cops, fixated_steps(fixated_cop_positions, robber_position))
     }
 
-    def cop_transitions(_cop_positions: list[int], _robber_position: int) -> Iterable[list[int]]:
-        for position in filter(lambda p: p not in cop_transition_cache, _cop_positions):
-            cop_transition_cache[position] = list(graph.neighbors(position))
-            cop_transition_cache[position].append(position)
+    # the moves of fixated cops are the same in every state, so the choice between fixated and free moves per cop is
+    # made once here instead of for every expanded state
+    fixated_cop_moves = [
+        [cop_fixated_steps[cop_id]] if cop_id in hidden_cops else None
+        for cop_id in range(len(cop_positions))
+    ]
+
+    # cop moves are generated as the tuples of the product itself instead of allocating a list for every successor
+    # the best move is only turned into a list once the search is finished
+    def cop_transitions(_cop_positions: list[int], _robber_position: int) -> Iterable[tuple[int, ...]]:
+        for position in _cop_positions:
+            if position not in cop_transition_cache:
+                cop_transition_cache[position] = (*graph.neighbors(position), position)
+
+        moves = product(*[
+            cop_transition_cache[cop_position] if fixated_cop_move is None else fixated_cop_move
+            for cop_position, fixated_cop_move in zip(_cop_positions, fixated_cop_moves)
+        ])
+
+        if len(_cop_positions) < 2:
+            return moves
 
-        yield from map(list, product(*[
-            cop_transition_cache[cop_position]
-            if cop_id not in hidden_cops
-            else [cop_fixated_steps[cop_id]]
-            for cop_id, cop_position in enumerate(_cop_positions)
-        ]))
+        # moves that only differ in the order of the cops lead to the same configuration in the transposition table
+        # we only keep the first of them to not expand the same configuration several times
+        return distinct_cop_moves(moves)
 
     move = cop_positions if cop_turn else robber_position
     value = 0
@@ -136,10 +182,13 @@ def iterative_deepening_minimax(
             robber_position,
             cop_turn,
             depth,
-            finish_time
+            finish_time,
+            evaluator=evaluator
         )
 
-    for depth in range(max_depth + 1):
+    # a search of depth 0 only evaluates the current configuration as a leaf and stays in place, which a search of
+    # depth 1 does as well if it runs out of time, so we skip it and the transposition table accesses it would cost
+    for depth in range(min(1, max_depth), max_depth + 1):
         if not minimax_iteration() or value == 1:
             break
 
@@ -147,6 +196,6 @@ def iterative_deepening_minimax(
     # in this case it is necessary to find a permutation of that move through which every position in the move can
     # actually be reached by each cop
     if cop_turn:
-        move = restore_possible_move_permutation(graph, cop_positions, move)
+        move = restore_possible_move_permutation(graph, cop_positions, list(move))
 
     return move, bool(value == 1)
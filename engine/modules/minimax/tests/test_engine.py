@@ -16,3 +16,16 @@ class TestEngine(unittest.TestCase):
         expected = None
 
         self.assertTrue((actual == expected).all())
+
+    def test_effective_game_graph_hidden_cops(self):
+        # the cop indices 0 and 1 coincide with node labels, so cops must be found by their positions
+        graph = nx.path_graph(5)
+        cop_positions = [4, 1]
+        robber_position = 0
+        actual = [
+            (set(subgraph.nodes), hidden_cops)
+            for subgraph, hidden_cops in effective_game_graph(graph, cop_positions, robber_position, 10)
+        ]
+        expected = [({0, 1}, {0}), ({0, 1, 2, 3, 4}, set())]
+
+        self.assertEqual(expected, actual)
@@ -0,0 +1,71 @@
+import unittest
+import networkx as nx
+import numpy as np
+
+from group3.engine.modules.minimax.zobrist import ZobristTranspositionTable
+
+
+class TestZobristTranspositionTable(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(0)
+        self.graph = nx.petersen_graph()
+        self.transposition = ZobristTranspositionTable(self.graph, 3)
+
+    def test_key_cop_order(self):
+        key = self.transposition.key([0, 5, 7], 2, True)
+
+        self.assertEqual(key, self.transposition.key((7, 0, 5), 2, True))
+        self.assertNotEqual(key, self.transposition.key([0, 5, 7], 2, False))
+        self.assertEqual(self.transposition.key([5, 0, 5], 2, True), self.transposition.key([5, 5, 0], 2, True))
+        self.assertNotEqual(self.transposition.key([5, 0, 5], 2, True), self.transposition.key([0, 5], 2, True))
+
+    def test_robber_move_key(self):
+        for cop_positions in ([0, 5, 7], [3, 3, 9]):
+            for robber_position in self.graph.nodes:
+                key = self.transposition.key(cop_positions, robber_position, False)
+
+                for robber_target in [robber_position, *self.graph.neighbors(robber_position)]:
+                    actual = self.transposition.robber_move_key(key, robber_position, robber_target)
+                    expected = self.transposition.key(cop_positions, robber_target, True)
+
+                    self.assertEqual(expected, actual)
+
+    def test_lookup_and_hint(self):
+        key = self.transposition.key([0, 5, 7], 2, True)
+
+        self.assertIsNone(self.transposition.lookup(key, 0))
+        self.assertIsNone(self.transposition.hint(key))
+
+        self.assertEqual(((1, 5, 7), 0), self.transposition.store(key, 2, (1, 5, 7), 0))
+        self.assertEqual(((1, 5, 7), 0), self.transposition.lookup(key, 2))
+        self.assertIsNone(self.transposition.lookup(key, 3))
+        self.assertEqual((1, 5, 7), self.transposition.hint(key))
+
+        # entries for a lower remaining depth do not replace entries for a higher one
+        self.assertEqual(((1, 5, 7), 0), self.transposition.store(key, 1, (4, 5, 7), 1))
+        self.assertEqual(((4, 0, 7), 1), self.transposition.store(key, 3, (4, 0, 7), 1))
+        self.assertEqual(((4, 0, 7), 1), self.transposition.lookup(key, 3))
+
+    def test_evict(self):
+        transposition = ZobristTranspositionTable(self.graph, 1, max_size=8)
+
+        for key in range(8):
+            transposition.store(key, 1, 0, 0)
+
+        self.assertEqual(list(range(8)), list(transposition.table))
+
+        # exceeding the maximum size evicts the oldest quarter of the entries
+        transposition.store(8, 1, 0, 0)
+
+        self.assertEqual(list(range(2, 9)), list(transposition.table))
+
+        # replacing an entry does not change its age
+        transposition.store(2, 2, 0, 0)
+        transposition.store(9, 1, 0, 0)
+
+        self.assertEqual(list(range(2, 10)), list(transposition.table))
+
+        transposition[[0], 0, True, 1] = 0, 0
+
+        self.assertEqual([*range(4, 10), transposition.key([0], 0, True)], list(transposition.table))
@@ -1,33 +1,51 @@
-from collections import Counter
 from functools import reduce
+from itertools import islice
 from operator import xor
 
 import numpy as np
 from networkx import Graph
 
-Move = int | list[int]
+Move = int | list[int] | tuple[int, ...]  # cop moves are tuples inside the search and lists outside of it
 TranspositionItem = tuple[list[int], int, bool, int]
 
+MAX_TABLE_SIZE = 1 << 20  # default number of entries after which the oldest entries of the table are evicted
+EVICTION_FRACTION = 4  # the oldest 1 / EVICTION_FRACTION of the entries are evicted at once
+
 
 class ZobristTranspositionTable:
-    table: dict[int, tuple[int, Move, float]]
-    cop_keys: dict[int, np.ndarray]
-    robber_keys: dict[int, np.ndarray]
+    __slots__ = (
+        "table",
+        "cop_keys",
+        "robber_keys",
+        "cop_turn_key",
+        "turn_switch_key",
+        "max_size",
+    )
+
+    table: dict[int, tuple[int, tuple[Move, float]]]
+    cop_keys: dict[int, list[int]]
+    robber_keys: dict[int, int]
     cop_turn_key: dict[bool, int]
+    turn_switch_key: int
+    max_size: int
 
-    def __init__(self, graph: Graph, n_cops: int):
+    def __init__(self, graph: Graph, n_cops: int, max_size: int = MAX_TABLE_SIZE):
+        # entries hold the remaining depth and the tuple of move and evaluation, which is handed out as is on lookups
         self.table = {}
+        self.max_size = max_size
 
-        def generate_random_keys(*shape: int) -> np.ndarray:
+        def generate_random_keys(*shape: int) -> list:
+            # keys are plain Python integers as they are cheaper to combine and hash than NumPy scalars
             int_info = np.iinfo(np.int64)
-            return np.random.randint(int_info.min, int_info.max, shape, dtype=np.int64)
+            return np.random.randint(int_info.min, int_info.max, shape, dtype=np.int64).tolist()
 
         n_nodes = graph.number_of_nodes()
         self.cop_keys = dict(zip(graph.nodes, generate_random_keys(n_nodes, n_cops)))
         self.robber_keys = dict(zip(graph.nodes, generate_random_keys(n_nodes)))
         self.cop_turn_key = dict(zip([True, False], generate_random_keys(2)))
+        self.turn_switch_key = self.cop_turn_key[True] ^ self.cop_turn_key[False]
 
-    def key(self, cop_positions: list[int], robber_position: int, cop_turn: bool) -> int:
+    def key(self, cop_positions: list[int] | tuple[int, ...], robber_position: int, cop_turn: bool) -> int:
         """ Computes the hash keys for a given configuration of the game.
 
         The hash key is computed as the xor between the cop key, the robber key, and the turn key.
@@ -47,13 +65,90 @@ class ZobristTranspositionTable:
         :return: The hash value for the given game configuration.
         """
         # map cop positions to cop keys taking into consideration the number of cops on the same node
-        cop_keys = map(
-            lambda position: self.cop_keys[position][freq[position] - 1],
-            freq := Counter(cop_positions)
-        )
+        # usually, all cops stand on distinct nodes, so every position is counted once and we can skip counting
+        if len(set(cop_positions)) == len(cop_positions):
+            cop_key = reduce(xor, (self.cop_keys[position][0] for position in cop_positions))
+        else:
+            # in sorted order, cops on the same node are adjacent, so we count them in a single pass over the runs
+            cop_key = 0
+            frequency = 0
+            positions = sorted(cop_positions)
+            for position, next_position in zip(positions, positions[1:] + [None]):
+                frequency += 1
+                if position != next_position:
+                    cop_key ^= self.cop_keys[position][frequency - 1]
+                    frequency = 0
 
         # we retrieve the hash value as the xor of all cop keys, the robber key, and the turn key
-        return reduce(xor, cop_keys) ^ self.robber_keys[robber_position] ^ self.cop_turn_key[cop_turn]
+        return cop_key ^ self.robber_keys[robber_position] ^ self.cop_turn_key[cop_turn]
+
+    def robber_move_key(self, key: int, robber_position: int, robber_target: int) -> int:
+        """ Updates the hash key of a configuration in which the robber is to move for a given robber move.
+
+        As only the robber position and the turn change, we xor out their old keys and xor in their new keys instead of
+        recomputing the key for all cop positions.
+
+        :param key: The hash key of the configuration before the move as computed by 'key'.
+        :param robber_position: The robber position before the move.
+        :param robber_target: The robber position after the move.
+        :return: The hash key of the configuration after the move, in which the cops are to move.
+        """
+        robber_keys = self.robber_keys
+        return key ^ robber_keys[robber_position] ^ robber_keys[robber_target] ^ self.turn_switch_key
+
+    def lookup(self, key: int, depth: int) -> tuple[Move, float] | None:
+        """ Retrieves the entry for a hashed game configuration if it was stored for at least a given remaining depth.
+
+        :param key: The hash key of the game configuration as computed by 'key'.
+        :param depth: The minimum remaining search depth of the entry.
+        :return: A tuple of the stored move and the evaluation of that move or None if there is no such entry.
+        """
+        entry = self.table.get(key)
+        if entry is None or entry[0] < depth:
+            return None
+
+        return entry[1]
+
+    def hint(self, key: int) -> Move | None:
+        """ Retrieves the best move stored for a hashed game configuration regardless of the depth it was stored for.
+
+        Even if the entry was computed for a lower remaining depth, its move is a good guess for the best move at a
+        higher depth, e.g., in the next iteration of iterative deepening.
+
+        :param key: The hash key of the game configuration as computed by 'key'.
+        :return: The stored move or None if there is no entry.
+        """
+        entry = self.table.get(key)
+        return None if entry is None else entry[1][0]
+
+    def store(self, key: int, depth: int, move: Move, evaluation: float) -> tuple[Move, float]:
+        """ Stores an entry for a hashed game configuration unless there is an entry for a higher remaining depth.
+
+        :param key: The hash key of the game configuration as computed by 'key'.
+        :param depth: The remaining search depth for which the entry was computed.
+        :param move: The best move in the game configuration.
+        :param evaluation: The evaluation of that move.
+        :return: A tuple of the move and the evaluation that are stored for the game configuration afterwards.
+        """
+        entry = self.table.get(key)
+        if entry is None or entry[0] < depth:
+            entry = self.table[key] = depth, (move, evaluation)
+
+            if len(self.table) > self.max_size:
+                self.evict()
+
+        return entry[1]
+
+    def evict(self) -> None:
+        """ Removes the oldest entries from the transposition table to bound its memory.
+
+        As dictionaries keep the insertion order, the first entries of the table are the ones that were added the
+        longest time ago. Those most likely stem from previous turns or games, so they are the least likely to be looked
+        up again.
+        """
+        n_evicted = len(self.table) // EVICTION_FRACTION
+        for key in list(islice(self.table, n_evicted)):
+            del self.table[key]
 
     def __getitem__(self, item: TranspositionItem) -> tuple[Move, float]:
         """ Retrieves a hashed entry for a given game configuration.
@@ -68,9 +163,9 @@ class ZobristTranspositionTable:
         """
         cop_positions, robber_position, cop_turn, depth = item
         key = self.key(cop_positions, robber_position, cop_turn)
-        hash_depth, move, evaluation = self.table[key]
+        hash_depth, value = self.table[key]
 
-        return move, evaluation
+        return value
 
     def __contains__(self, item: TranspositionItem) -> bool:
         """ Checks whether there is an entry for a certain game configuration.
@@ -99,11 +194,11 @@ class ZobristTranspositionTable:
         :param value: A tuple of the move and its evaluation for the give game configuration.
         """
         cop_positions, robber_position, cop_turn, depth = item
-        move, evaluation = value
         key = self.key(cop_positions, robber_position, cop_turn)
-        entry = depth, move, evaluation
 
-        if key not in self.table:
-            self.table[key] = entry
-        else:
-            self.table[key] = max(self.table[key], entry, key=lambda v: v[0])
+        entry = self.table.get(key)
+        if entry is None or entry[0] < depth:
+            self.table[key] = depth, value
+
+            if len(self.table) > self.max_size:
+                self.evict()
@@ -1,15 +1,14 @@
 import random
 import time
-from collections import defaultdict
 from typing import Iterable
 
 import numpy as np
-from networkx import Graph, pagerank, set_edge_attributes, PowerIterationFailedConvergence
+from networkx import Graph, PowerIterationFailedConvergence
 
 from .base import BaseCopsStrategy
 from ..abstraction import AbstractionHierarchy, GraphAbstraction, ShortestPathLengthStore, UndominatedNeighborhoodEdgeRankStore
 from ..minimax import MinimaxEngine
-from ..util import gon, remaining_time, multi_target_shortest_path, first_step_on_path, disjoint_search_steps, wang_cheng_weighted_k_center, timeout_loop
+from ..util import gon, remaining_time, masked_multi_target_shortest_path, index_adjacency, first_step_on_path, disjoint_search_steps, wang_cheng_weighted_k_center, timeout_loop, csr_adjacency, sparse_pagerank
 
 MINIMAX_DEPTH = 6
 
@@ -31,25 +30,26 @@ class AbstractMinimaxDisjointRefinementCopsStrategy(BaseCopsStrategy):
     def __init__(self, graph: Graph, n_cops: int, finish_time: float):
         self.graph = graph
         self.n_cops = n_cops
-        self.minimax_timeout_probability = defaultdict(lambda: 0)
-        self.minimax_probability = defaultdict(lambda: 1)
+        self.minimax_timeout_probability = {}  # absent configurations have a timeout probability of 0
+        self.minimax_probability = {}  # absent configurations have a minimax probability of 1
 
         # set up a hierarchy of abstractions and populate shortest path lengths and edge ranks for each abstraction
         self.hierarchy = AbstractionHierarchy(graph)
         self.hierarchy.populate_shortest_path_lengths(remaining_time(finish_time, 0.75))
         self.hierarchy.populate_undominated_neighborhood_ranks(remaining_time(finish_time, 0.75))
 
+        # set up stores for shortest path lengths and edge ranks for the literal graph
+        self.shortest_path_lengths = ShortestPathLengthStore()
+        self.undominated_neighborhood_ranks = UndominatedNeighborhoodEdgeRankStore()
+
         # set up minimax engines for the literal graph and each level of abstraction
-        self.literal_minimax_engine = MinimaxEngine(graph, n_cops)
+        # the engines order their search by the shortest path lengths of their graph once they are populated
+        self.literal_minimax_engine = MinimaxEngine(graph, n_cops, self.shortest_path_lengths)
         self.minimax_engine = {
-            abstraction: MinimaxEngine(abstraction.graph, n_cops)
+            abstraction: MinimaxEngine(abstraction.graph, n_cops, abstraction.shortest_path_lengths)
             for abstraction in self.hierarchy.abstractions
         }
 
-        # set up stores for shortest path lengths and edge ranks for the literal graph
-        self.shortest_path_lengths = ShortestPathLengthStore()
-        self.undominated_neighborhood_ranks = UndominatedNeighborhoodEdgeRankStore()
-
         # compute starting positions and populate shortest path lengths and edge ranks for the literal graph
         self.init_positions = self.compute_init_positions()
         self.shortest_path_lengths.populate(graph, remaining_time(finish_time, 0.75))
@@ -85,27 +85,26 @@ class AbstractMinimaxDisjointRefinementCopsStrategy(BaseCopsStrategy):
         def compute_centers(
             graph: Graph,
             edge_weights: dict[tuple[int, int], float],
-            distances: dict[int, dict[int, int]]
+            shortest_path_lengths: ShortestPathLengthStore
         ) -> list[int]:
-            set_edge_attributes(graph, edge_weights, "rank-edge-weight")
+            nodes, _, adjacency = csr_adjacency(graph)
 
             try:
-                vertex_ranks = pagerank(graph, weight="rank-edge-weight")
+                vertex_ranks = sparse_pagerank(adjacency, nodes, edge_weights)
             except PowerIterationFailedConvergence:
                 vertex_ranks = dict(graph.degree)
 
-            return wang_cheng_weighted_k_center(
-                graph,
-                distances,
-                vertex_ranks,
-                self.n_cops
-            )
+            # the rows of the distance matrix follow the node order of the graph just like the adjacency matrix
+            weights = np.fromiter(map(vertex_ranks.__getitem__, nodes), dtype=float, count=len(nodes))
+            centers = wang_cheng_weighted_k_center(shortest_path_lengths.distance_matrix, weights, self.n_cops)
+
+            return [nodes[center] for center in centers]
 
         if self.shortest_path_lengths.is_populated and self.undominated_neighborhood_ranks.is_populated:
             return compute_centers(
                 self.graph,
                 self.undominated_neighborhood_ranks.ranks,
-                self.shortest_path_lengths.pairwise_distances
+                self.shortest_path_lengths
             )
 
         def suited_abstraction(abstraction: GraphAbstraction) -> bool:
@@ -120,7 +119,7 @@ class AbstractMinimaxDisjointRefinementCopsStrategy(BaseCopsStrategy):
         abstract_starting_positions = compute_centers(
             lowest_suited_abstraction.graph,
             lowest_suited_abstraction.undominated_neighborhood_ranks.ranks,
-            lowest_suited_abstraction.shortest_path_lengths.pairwise_distances
+            lowest_suited_abstraction.shortest_path_lengths
         )
 
         return [
@@ -153,8 +152,10 @@ class AbstractMinimaxDisjointRefinementCopsStrategy(BaseCopsStrategy):
         minimax_abstraction = self.hierarchy.highest_undecided_abstraction(cop_positions, robber_position)
         position_key = robber_position, *cop_positions
 
-        if minimax_abstraction is not None and random.random() < self.minimax_probability[position_key]:
-            self.minimax_probability[position_key] /= 2
+        minimax_probability = self.minimax_probability.get(position_key, 1)
+
+        if minimax_abstraction is not None and random.random() < minimax_probability:
+            self.minimax_probability[position_key] = minimax_probability / 2
             return self.minimax_refinement(cop_positions, robber_position, minimax_abstraction, finish_time)
 
         return disjoint_search_steps(self.graph, cop_positions, robber_position)
@@ -210,8 +211,10 @@ class AbstractMinimaxDisjointRefinementCopsStrategy(BaseCopsStrategy):
 
             # stop at the current level of abstraction with the probability of a timeout occurring
             # we cut the timeout probability in half to make sure we try again at some point
-            if random.random() < self.minimax_timeout_probability[timeout_key]:
-                self.minimax_timeout_probability[timeout_key] /= 2
+            timeout_probability = self.minimax_timeout_probability.get(timeout_key, 0)
+
+            if random.random() < timeout_probability:
+                self.minimax_timeout_probability[timeout_key] = timeout_probability / 2
                 break
 
             # pessimistically set timeout probability to 1 before the computation
@@ -339,7 +342,8 @@ class AbstractMinimaxDisjointRefinementCopsStrategy(BaseCopsStrategy):
         def reduced_search(graph: Graph, source: int, targets: Iterable[int], nodes: Iterable[int]) -> list[int]:
             """ Finds a shortest path from a source to some of the multiple possible targets on a subset of the nodes.
 
-            The search will be performed on the subgraph induced by the given set of nodes.
+            The search will be performed on the subgraph induced by the given set of nodes. Instead of constructing that
+            subgraph, we flag the nodes in a mask over the node indices of the graph and let the search skip all others.
 
             :param graph: The graph through which to search.
             :param source: The node from which to start the search.
@@ -347,10 +351,27 @@ class AbstractMinimaxDisjointRefinementCopsStrategy(BaseCopsStrategy):
             :param nodes: The subset of nodes through which to search.
             :return: A shortest path to any of the given targets in the subgraph induced by the given nodes.
             """
-            search_graph = graph.subgraph(nodes)
-            return multi_target_shortest_path(search_graph, source, targets)
+            graph_nodes, node_indices, neighbors = index_adjacency(graph)
+
+            node_mask = bytearray(len(graph_nodes))
+            for node in nodes:
+                node_mask[node_indices[node]] = 1
+
+            target_mask = bytearray(len(graph_nodes))
+            for target in targets:
+                target_mask[node_indices[target]] = 1
+
+            path = masked_multi_target_shortest_path(neighbors, node_indices[source], target_mask, node_mask)
+            return list(map(graph_nodes.__getitem__, path))
+
+        # steps of cops that start at the same position and search towards the same target are the same
+        steps = {}
 
         for cop_id, (cop_position, abstract_target) in enumerate(zip(cop_positions, abstract_targets)):
+            if (cop_position, abstract_target) in steps:
+                move.append(steps[cop_position, abstract_target])
+                continue
+
             cop_abstract_targets = [abstract_target]  # possible targets to search a path to
             refinement_nodes = abstraction.graph.nodes  # nodes which to use for the search
 
@@ -375,7 +396,7 @@ class AbstractMinimaxDisjointRefinementCopsStrategy(BaseCopsStrategy):
 
             # finally, we search for a path in the actual graph and let the cop move a step on that path
             path = reduced_search(self.graph, cop_position, cop_abstract_targets, refinement_nodes)
-            step = first_step_on_path(path)
+            step = steps[cop_position, abstract_target] = first_step_on_path(path)
             move.append(step)
 
         return move
@@ -385,12 +406,11 @@ class AbstractMinimaxDisjointRefinementCopsStrategy(BaseCopsStrategy):
             return
 
         nodes = list(self.graph.nodes)
-        distance = self.shortest_path_lengths.pairwise_distances
+        node_indices = self.shortest_path_lengths.node_indices
 
-        cop_start_distances = np.array([
-            min(distance[node][cop_position] for cop_position in self.init_positions)
-            for node in nodes
-        ])
+        # distances from every node to the closest cop read off the distance matrix, whose rows follow the node order
+        cop_start_indices = [node_indices[cop_position] for cop_position in self.init_positions]
+        cop_start_distances = self.shortest_path_lengths.distance_matrix[:, cop_start_indices].min(axis=1)
 
         def softmax(x: np.ndarray) -> np.ndarray:
             exp = np.exp(x - np.max(x))
@@ -438,7 +458,7 @@ class AbstractMinimaxDisjointRefinementCopsStrategy(BaseCopsStrategy):
                     next_cop_positions = [
                         min(
                             abstraction.invert_node(abstract_cop_position),
-                            key=lambda v: self.shortest_path_lengths.pairwise_distances[v][cop_position]
+                            key=lambda v: self.shortest_path_lengths.distance(v, cop_position)
                         ) for cop_position, abstract_cop_position in zip(cop_positions, abstract_cop_positions)
                     ]
 
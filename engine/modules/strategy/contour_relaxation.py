@@ -1,22 +1,27 @@
 from __future__ import annotations
 
 import random
-from collections import defaultdict
 
+import numpy as np
 from networkx import Graph
+from scipy.sparse import csr_array
 
 from .base import BaseRobberStrategy
 from ..abstraction import AbstractionHierarchy
 from ..abstraction.store import ShortestPathLengthStore
-from ..util import remaining_time, timeout_loop
+from ..util import csr_adjacency, remaining_time, timeout_loop
 
 
 class ContourRelaxationRobberStrategy(BaseRobberStrategy):
     hierarchy: AbstractionHierarchy
     shortest_path_lengths: ShortestPathLengthStore
+    nodes: list[int]
+    node_indices: dict[int, int]
+    adjacency: csr_array
 
     def __init__(self, graph: Graph, finish_time: float):
         self.hierarchy = AbstractionHierarchy(graph)
+        self.nodes, self.node_indices, self.adjacency = csr_adjacency(self.hierarchy.graph)
         self.hierarchy.populate_shortest_path_lengths(remaining_time(finish_time, 0.8))
 
         self.shortest_path_lengths = ShortestPathLengthStore()
@@ -27,7 +32,7 @@ class ContourRelaxationRobberStrategy(BaseRobberStrategy):
             return max(
                 self.hierarchy.graph.nodes,
                 key=lambda node: min(
-                    self.shortest_path_lengths.pairwise_distances[node][cop_position]
+                    self.shortest_path_lengths.distance(node, cop_position)
                     for cop_position in cop_positions
                 )
             )
@@ -35,7 +40,7 @@ class ContourRelaxationRobberStrategy(BaseRobberStrategy):
             abstract_node = max(
                 abstraction.graph.nodes,
                 key=lambda node: min(
-                    abstraction.shortest_path_lengths.pairwise_distances[node][abstract_cop_position]
+                    abstraction.shortest_path_lengths.distance(node, abstract_cop_position)
                     for abstract_cop_position in map(abstraction.abstract_node, cop_positions)
                 )
             )
@@ -57,56 +62,61 @@ class ContourRelaxationRobberStrategy(BaseRobberStrategy):
         :param finish_time: Time stamp indicating when the solution must have been returned at the latest.
         :return: The next robber position.
         """
-        visited = defaultdict(lambda: False)  # stores which vertices have been visited
-        robber_predecessor = {}  # stores the predecessors to get to a vertex relaxed in a robber contour
-
-        # checks if a vertex has been relaxed by any expansion
-        def unvisited(_node: int) -> bool:
-            return not visited[_node]
+        visited = np.zeros(len(self.nodes), dtype=bool)  # stores which vertices have been visited
+        robber_predecessor = np.full(len(self.nodes), -1)  # predecessors to get to a vertex relaxed in a robber contour
+        robber_index = self.node_indices[robber_position]
 
         def get_robber_move(_node: int) -> int:
             """ Computes the neighbor to which the robber has to move on the shortest path to a certain vertex.
 
-            :param _node: The node the robber should move towards.
+            :param _node: The index of the node the robber should move towards.
             :return: The neighbor of the current robber position that is on a shortest path to the given node.
             """
-            while _node in robber_predecessor and robber_predecessor[_node] != robber_position:
+            while robber_predecessor[_node] != -1 and robber_predecessor[_node] != robber_index:
                 _node = robber_predecessor[_node]
-            return _node
+            return self.nodes[_node]
+
+        def expand(contour: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            """ Computes the unvisited neighbors of a contour.
+
+            :param contour: The indices of the nodes in the contour.
+            :return: The indices of the unvisited neighbors and the index of a contour node adjacent to each of them.
+            """
+            contour_adjacency = self.adjacency[contour]
+            neighbors = contour_adjacency.indices
+            sources = np.repeat(contour, np.diff(contour_adjacency.indptr))
 
-        cop_contour = set(cop_positions)  # initial contour around the cops are the current cop positions
-        robber_contour = {robber_position}  # initial contour around the robber is the current robber position
-        robber_cover_node = robber_position  # the robber position cannot be reached by any cop in 0 moves
+            unvisited = ~visited[neighbors]
+            neighbors, first_occurrences = np.unique(neighbors[unvisited], return_index=True)
+            return neighbors, sources[unvisited][first_occurrences]
+
+        # initial contour around the cops are the current cop positions
+        cop_contour = np.array([self.node_indices[cop_position] for cop_position in cop_positions])
+        robber_contour = np.array([robber_index])  # initial contour around the robber is the current robber position
+        robber_cover_node = robber_index  # the robber position cannot be reached by any cop in 0 moves
 
         @timeout_loop(finish_time)
         def relax_and_expand_contour():
             nonlocal cop_contour, robber_contour, robber_cover_node
 
-            next_cop_contour = set()
-            next_robber_contour = set()
-
             # expand unvisited neighbors around the cop contours
-            for node in filter(unvisited, cop_contour):
-                visited[node] = True
-                unvisited_neighbors = filter(unvisited, self.hierarchy.graph.neighbors(node))
-                next_cop_contour.update(unvisited_neighbors)
+            cop_contour = cop_contour[~visited[cop_contour]]
+            visited[cop_contour] = True
+            cop_contour, _ = expand(cop_contour)
 
             # expand unvisited neighbors around the robber contour
-            for node in filter(unvisited, robber_contour):
-                visited[node] = True
+            robber_contour = robber_contour[~visited[robber_contour]]
+            visited[robber_contour] = True
+            if len(robber_contour):
                 # this vertex was expanded in the last iteration and hasn't been reached by any cop at that point
-                robber_cover_node = node
-
-                for neighbor in filter(unvisited, self.hierarchy.graph.neighbors(node)):
-                    next_robber_contour.add(neighbor)
-                    robber_predecessor[neighbor] = node
+                robber_cover_node = robber_contour[-1]
 
-            cop_contour = next_cop_contour
-            robber_contour = next_robber_contour
+            robber_contour, predecessors = expand(robber_contour)
+            robber_predecessor[robber_contour] = predecessors
 
         # as long as there are contours to relax, relax the contours
         # if time runs out early, we stop early and use the best solution we got so far
-        while cop_contour and robber_contour:
+        while len(cop_contour) and len(robber_contour):
             if not relax_and_expand_contour():
                 break
 
@@ -1,14 +1,27 @@
 from .approximation import gon, wang_cheng_weighted_k_center
-from .search import multi_target_shortest_path, farthest_node, disjoint_search_steps, first_step_on_path
+from .search import (
+    multi_target_shortest_path,
+    masked_multi_target_shortest_path,
+    farthest_node,
+    disjoint_search_steps,
+    first_step_on_path,
+    index_adjacency
+)
+from .sparse import csr_adjacency, masked_adjacency, sparse_pagerank
 from .timeout import timeout_loop, remaining_time
 
 __ALL__ = (
     "gon",
     "wang_cheng_weighted_k_center",
     "multi_target_shortest_path",
+    "masked_multi_target_shortest_path",
     "timeout_loop",
     "remaining_time",
     "farthest_node",
     "disjoint_search",
-    "first_step_on_path"
+    "first_step_on_path",
+    "index_adjacency",
+    "csr_adjacency",
+    "masked_adjacency",
+    "sparse_pagerank"
 )
@@ -1,6 +1,6 @@
 import random
-from heapq import nsmallest
 
+import numpy as np
 from networkx import Graph
 
 from .search import farthest_node
@@ -30,9 +30,8 @@ def gon(graph: Graph, k: int) -> list[int]:
 
 
 def greedy_weighted_k_center(
-    graph: Graph,
-    pairwise_distances: dict[int, dict[int, int]],
-    weights: dict[int, float],
+    distance_matrix: np.ndarray,
+    weights: np.ndarray,
     d: int,
     upper_bound: float = float("inf")
 ) -> list[int]:
@@ -43,39 +42,38 @@ def greedy_weighted_k_center(
     undirected graphs simplifies the local neighborhood of a node in d-restricted graphs to the set of nodes that are at
     most 2*d away. This significantly speeds up the computation in each iteration.
 
+    Nodes are addressed by their index in the distance matrix. Every iteration covers the neighborhood of the new center
+    with a single comparison on its row of the matrix. Nodes that are not connected to the center are not covered.
+
     If the solution exceeds an optionally given upper bound, we stop early and return the current solution. In this case
     there is no guarantee of a 2-approximation.
 
-    :param graph: The undirected graph to compute k central nodes for.
-    :param pairwise_distances: Map containing the pairwise distances between all vertices.
-    :param weights: Map containing the weights for each vertex.
+    :param distance_matrix: Matrix containing the pairwise distances between all vertices, -1 for vertices that are not
+    connected.
+    :param weights: The weight of each vertex.
     :param d: Distance to restrict the local neighborhood of each vertex to.
     :param upper_bound: An upper bound on the size of the solution.
-    :return: A list of greedily highly-weighted central vertices such that every vertex has distance at most 2*d to any
-    of these central vertices.
+    :return: A list of indices of greedily highly-weighted central vertices such that every vertex has distance at most
+    2*d to any of these central vertices.
     """
     centers = []
-    nodes = set(graph.nodes)
+    uncovered_weights = weights.astype(float)  # weights of the vertices not covered yet, -inf for covered ones
 
-    while nodes:
-        center = max(nodes, key=weights.get)
+    while uncovered_weights.max() > -np.inf:
+        center = int(uncovered_weights.argmax())
         centers.append(center)
 
         if len(centers) > upper_bound:
             break
 
-        nodes.remove(center)
-        nodes -= {node for node in nodes if pairwise_distances[center][node] <= 2 * d}
+        center_distances = distance_matrix[center]
+        uncovered_weights[(center_distances >= 0) & (center_distances <= 2 * d)] = -np.inf
+        uncovered_weights[center] = -np.inf
 
     return centers
 
 
-def wang_cheng_weighted_k_center(
-    graph: Graph,
-    pairwise_distances: dict[int, dict[int, int]],
-    weights: dict[int, float],
-    k: int
-) -> list[int]:
+def wang_cheng_weighted_k_center(distance_matrix: np.ndarray, weights: np.ndarray, k: int) -> list[int]:
     """ Computes a 2-approximation for the weighted vertex k-center problem.
 
     The algorithm is adapted for undirected graphs taken from `A Heuristic Algorithm for the k-Center Problem with
@@ -83,19 +81,20 @@ def wang_cheng_weighted_k_center(
 
     We assume that the graph contains at least one node.
 
-    :param graph: The undirected graph to compute k central nodes for.
-    :param pairwise_distances: Map containing the pairwise distances between all vertices.
-    :param weights: Map containing the weights for each vertex.
+    :param distance_matrix: Matrix containing the pairwise distances between all vertices, -1 for vertices that are not
+    connected, e.g. as computed by the 'ShortestPathLengthStore'.
+    :param weights: The weight of each vertex in the order of the distance matrix.
     :param k: Number of centers to compute.
-    :return: k central vertices in the graph.
+    :return: The indices of k central vertices in the distance matrix.
     """
     centers = []
-    different_distances = set().union(*[distances.values() for distances in pairwise_distances.values()])
+    reachable = distance_matrix >= 0
+    different_distances = np.unique(distance_matrix[reachable]).tolist()
 
     # for any distance that exists between two vertices in the graph, we greedily compute a 2-approximation using an
     # unfixed number of centers until we find a solution that is small enough
-    for distance in sorted(different_distances):
-        greedy_d_centers = greedy_weighted_k_center(graph, pairwise_distances, weights, distance, k)
+    for distance in different_distances:
+        greedy_d_centers = greedy_weighted_k_center(distance_matrix, weights, distance, k)
 
         if len(greedy_d_centers) <= k:
             centers = greedy_d_centers
@@ -104,12 +103,15 @@ def wang_cheng_weighted_k_center(
     # if there are more centers to choose, we pick the ones with the smallest total distance to all nodes
     # if there are not enough different nodes to do that, we pick the remaining nodes randomly from the already chosen
     # centers
-    if len(centers) < k and len(graph.nodes) > 0:
-        def total_distance(node: int) -> float:
-            return sum(pairwise_distances[node].values())
-
-        nodes = [node for node in graph.nodes if node not in centers]
-        centers.extend(nsmallest(k - len(centers), nodes, key=total_distance))
+    n_nodes = len(distance_matrix)
+    if len(centers) < k and n_nodes > 0:
+        total_distances = np.where(reachable, distance_matrix, 0).sum(axis=1)
+        is_center = np.zeros(n_nodes, dtype=bool)
+        is_center[centers] = True
+
+        nodes = np.flatnonzero(~is_center)
+        nodes = nodes[np.argsort(total_distances[nodes], kind="stable")]
+        centers.extend(nodes[:k - len(centers)].tolist())
 
         if len(centers) < k:
             centers.extend(random.choices(list(centers), k=k - len(centers)))
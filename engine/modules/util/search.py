@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-from collections import defaultdict, deque
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
 from typing import Iterable
+from weakref import WeakKeyDictionary
 
-from networkx import Graph, astar_path
+from networkx import Graph, NetworkXNoPath
+
+from .sparse import csr_adjacency
+
+# neighbor indices of the graphs searched so far, see 'index_adjacency'
+_index_adjacencies: WeakKeyDictionary[Graph, tuple[list[int], dict[int, int], list[list[int]]]] = WeakKeyDictionary()
 
 
 def multi_target_shortest_path(graph: Graph, source: int, targets: Iterable[int]) -> list[int]:
     targets = set(targets)
-    visited = defaultdict(lambda: False)
     predecessors = {}
 
     def trace_path(target: int) -> list[int]:
@@ -21,50 +28,160 @@ def multi_target_shortest_path(graph: Graph, source: int, targets: Iterable[int]
         path.reverse()
         return path
 
+    discovered = {source}  # nodes that were put into the queue, i.e. every node is only expanded once
     discovered_nodes = deque([source])
 
     while discovered_nodes:
         node = discovered_nodes.popleft()
 
-        if visited[node]:
-            continue
-
         if node in targets:
             return trace_path(node)
 
-        visited[node] = True
-        unvisited_neighbors = filter(lambda v: not visited[v] and v not in predecessors, graph.neighbors(node))
-
-        for neighbor in unvisited_neighbors:
-            discovered_nodes.append(neighbor)
-            predecessors[neighbor] = node
+        for neighbor in graph.neighbors(node):
+            if neighbor not in discovered:
+                discovered.add(neighbor)
+                discovered_nodes.append(neighbor)
+                predecessors[neighbor] = node
 
     raise Exception(f"There is no path from {source} to any of {targets} in {graph}.")
 
 
-def farthest_node(graph: Graph, sources: list[int]) -> int:
-    visited = defaultdict(lambda: False)
+def masked_multi_target_shortest_path(
+    neighbors: list[list[int]],
+    source: int,
+    target_mask: bytearray,
+    node_mask: bytearray
+) -> list[int]:
+    """ Finds a shortest path from a source to any of multiple targets that only visits a subset of the nodes.
+
+    This is the same search as 'multi_target_shortest_path' on the subgraph induced by the subset of nodes, but it works
+    on node indices and skips excluded neighbors instead of constructing the subgraph.
+
+    :param neighbors: The neighbor indices of every node.
+    :param source: The index of the node from which to start the search.
+    :param target_mask: A flag for every node index whether the node is a target.
+    :param node_mask: A flag for every node index whether the path may visit the node.
+    :return: The indices of the nodes on a shortest path to the target that is found first.
+    """
+    discovered = bytearray(len(neighbors))
+    discovered[source] = 1
+    predecessors = {}
 
-    discovered_nodes = deque(sources)
-    last_visited_node = sources[0]
+    discovered_nodes = deque([source])
 
     while discovered_nodes:
         node = discovered_nodes.popleft()
 
-        if visited[node]:
-            continue
+        if target_mask[node]:
+            path = [node]
+            while node in predecessors:
+                node = predecessors[node]
+                path.append(node)
+
+            path.reverse()
+            return path
+
+        for neighbor in neighbors[node]:
+            if node_mask[neighbor] and not discovered[neighbor]:
+                discovered[neighbor] = 1
+                predecessors[neighbor] = node
+                discovered_nodes.append(neighbor)
 
-        visited[node] = True
-        last_visited_node = node
+    raise Exception(f"There is no path from {source} to any of the targets in the subset of nodes.")
 
-        unvisited_neighbors = filter(lambda v: not visited[v], graph.neighbors(node))
-        discovered_nodes.extend(unvisited_neighbors)
 
-    return last_visited_node
+def farthest_node(graph: Graph, sources: list[int]) -> int:
+    nodes, node_indices, neighbors = index_adjacency(graph)
+    discovered = bytearray(len(nodes))  # flags for the node indices that were put into the queue
+
+    discovered_nodes = deque()
+    for source in sources:
+        source_index = node_indices[source]
+        if not discovered[source_index]:
+            discovered[source_index] = 1
+            discovered_nodes.append(source_index)
 
+    last_visited_node = discovered_nodes[0]
 
-def penalty_astar(graph: Graph, source: int, target: int, penalty: dict[int, int]):
-    path = astar_path(graph, source, target, lambda v, _: penalty[v])
+    while discovered_nodes:
+        last_visited_node = node = discovered_nodes.popleft()
+
+        for neighbor in neighbors[node]:
+            if not discovered[neighbor]:
+                discovered[neighbor] = 1
+                discovered_nodes.append(neighbor)
+
+    return nodes[last_visited_node]
+
+
+def index_adjacency(graph: Graph) -> tuple[list[int], dict[int, int], list[list[int]]]:
+    """ Computes the neighbors of all nodes of a graph as lists of node indices.
+
+    The result is cached for every graph as long as the graph is alive, so repeated searches on the same graph do not
+    pay for the conversion again. Therefore, the graph must not be modified after it was first passed to this function.
+
+    :param graph: The graph to represent.
+    :return: The list of nodes, a mapping from nodes to their indices, and the neighbor indices of every node in the
+    order of the adjacency of the graph.
+    """
+    if graph not in _index_adjacencies:
+        nodes, node_indices, adjacency = csr_adjacency(graph)
+        indptr = adjacency.indptr.tolist()
+        indices = adjacency.indices.tolist()
+        neighbors = [indices[start:end] for start, end in zip(indptr[:-1], indptr[1:])]
+        _index_adjacencies[graph] = nodes, node_indices, neighbors
+
+    return _index_adjacencies[graph]
+
+
+def penalty_astar(neighbors: list[list[int]], source: int, target: int, penalty: list[int]) -> list[int]:
+    """ Computes a shortest path between two nodes that is guided by node penalties.
+
+    This is an A* search with unit edge weights that uses the penalty of a node as its heuristic. It expands nodes in
+    the same order as 'networkx.astar_path' does, but works on node indices instead of the graph.
+
+    :param neighbors: The neighbor indices of every node.
+    :param source: The index of the node the path starts at.
+    :param target: The index of the node the path ends at.
+    :param penalty: The penalty of every node index, which is increased for the nodes on the returned path.
+    :return: The indices of the nodes on the path from the source to the target.
+    """
+    counter = count()
+    queue = [(0, next(counter), source, 0, -1)]  # priority, tie breaker, node, cost to reach, and parent
+    enqueued = {}  # costs to reach and heuristics of enqueued nodes
+    explored = {}  # parents of explored nodes on the path closest to the source
+
+    while queue:
+        _, _, node, cost, parent = heappop(queue)
+
+        if node == target:
+            path = [node]
+            while parent != -1:
+                path.append(parent)
+                parent = explored[parent]
+            path.reverse()
+            break
+
+        if node in explored:
+            # do not override the parent of the source and skip paths that were enqueued before a better one was found
+            if explored[node] == -1 or enqueued[node][0] < cost:
+                continue
+
+        explored[node] = parent
+
+        neighbor_cost = cost + 1
+        for neighbor in neighbors[node]:
+            if neighbor in enqueued:
+                enqueued_cost, heuristic = enqueued[neighbor]
+                if enqueued_cost <= neighbor_cost:
+                    continue
+            else:
+                heuristic = penalty[neighbor]
+
+            enqueued[neighbor] = neighbor_cost, heuristic
+            heappush(queue, (neighbor_cost + heuristic, next(counter), neighbor, neighbor_cost, node))
+    else:
+        raise NetworkXNoPath(f"Node {target} not reachable from {source}")
 
     for node in path:
         penalty[node] += 1
@@ -73,13 +190,14 @@ def penalty_astar(graph: Graph, source: int, target: int, penalty: dict[int, int
 
 
 def disjoint_search_steps(graph: Graph, cop_positions: list[int], robber_position: int) -> list[int]:
+    nodes, node_indices, neighbors = index_adjacency(graph)
     move = []
-    penalty = defaultdict(lambda: 0)
+    penalty = [0] * len(nodes)
 
     for cop_position in cop_positions:
-        path = penalty_astar(graph, cop_position, robber_position, penalty)
+        path = penalty_astar(neighbors, node_indices[cop_position], node_indices[robber_position], penalty)
         step = first_step_on_path(path)
-        move.append(step)
+        move.append(nodes[step])
 
     return move
 
@@ -0,0 +1,29 @@
+import time
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from group3.engine.modules.abstraction import ShortestPathLengthStore
+from group3.engine.modules.util import wang_cheng_weighted_k_center
+
+
+class TestApproximation(unittest.TestCase):
+
+    def setUp(self):
+        # two paths 0 - 1 - 2 and 3 - 4 - 5 that are not connected to each other
+        self.graph = nx.disjoint_union(nx.path_graph(3), nx.path_graph(3))
+        self.shortest_path_lengths = ShortestPathLengthStore()
+        self.shortest_path_lengths.populate(self.graph, time.time() + 10)
+        self.weights = np.array([1, 2, 1, 1, 2, 1], dtype=float)
+
+    def test_wang_cheng_weighted_k_center_disconnected(self):
+        centers = wang_cheng_weighted_k_center(self.shortest_path_lengths.distance_matrix, self.weights, 2)
+
+        self.assertEqual([1, 4], centers)
+
+    def test_wang_cheng_weighted_k_center_fill_up(self):
+        # the additional centers are the remaining nodes with the smallest total distance to the nodes they reach
+        centers = wang_cheng_weighted_k_center(self.shortest_path_lengths.distance_matrix, self.weights, 4)
+
+        self.assertEqual([1, 4, 0, 2], centers)